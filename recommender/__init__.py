@@ -0,0 +1,44 @@
+"""Sistem rekomendasi properti Bukit Vista tanpa ketergantungan pada Streamlit."""
+from .artifact import (ARTIFACT_VERSION, DATA_FILE_PATTERN, FEATURE_PARTS, feature_file_name, feature_file_names, load_feature_matrix,
+                       read_artifact_manifest, read_data_manifest, read_property_table)
+from .core import RECOMMENDATION_MODES, RESULT_COLUMNS, Recommender
+from .features import VECTOR_COLUMNS, decode_vector_columns
+from .index import PartitionIndex, SimilarityIndex
+from .refresher import LoadedDataset, Refresher
+from .service import RecommenderService
+from .snapshot import SNAPSHOT_VERSION, default_cache_dir, load_snapshot, save_snapshot, snapshot_dir
+from .sources import DataSource, DriveSource, FakeDriveService, LocalDirectorySource, fetch_feature_file, open_source, select_latest_data_file
+
+__all__ = [
+    "ARTIFACT_VERSION",
+    "DATA_FILE_PATTERN",
+    "DataSource",
+    "DriveSource",
+    "FEATURE_PARTS",
+    "FakeDriveService",
+    "LoadedDataset",
+    "LocalDirectorySource",
+    "PartitionIndex",
+    "RECOMMENDATION_MODES",
+    "RESULT_COLUMNS",
+    "Recommender",
+    "RecommenderService",
+    "Refresher",
+    "SNAPSHOT_VERSION",
+    "SimilarityIndex",
+    "VECTOR_COLUMNS",
+    "decode_vector_columns",
+    "default_cache_dir",
+    "feature_file_name",
+    "feature_file_names",
+    "fetch_feature_file",
+    "load_snapshot",
+    "load_feature_matrix",
+    "open_source",
+    "read_artifact_manifest",
+    "read_data_manifest",
+    "read_property_table",
+    "save_snapshot",
+    "select_latest_data_file",
+    "snapshot_dir",
+]
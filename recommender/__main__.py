@@ -0,0 +1,83 @@
+"""CLI sederhana: python -m recommender query|serve --data <file> ..."""
+import argparse     # Mengimpor argparse untuk membaca argumen CLI
+import sys      # Mengimpor sys
+import time     # Mengimpor time untuk mengukur latensi
+
+from .core import RECOMMENDATION_MODES, Recommender
+from .snapshot import default_cache_dir
+from .sources import open_source
+
+
+def add_data_arguments(parser):
+    data = parser.add_mutually_exclusive_group(required=True)
+    data.add_argument("--data", help="Path to data_bukit_vista_<dd-mm-yyyy>.parquet or .xlsx")
+    data.add_argument("--source", help="Data source spec: local:<dir>, fakedrive:<root>/<folder_id> (latest file is used)")
+    parser.add_argument("--features", help="Path to the feature matrix (defaults to the file next to --data)")
+    parser.add_argument("--cache-dir", help="Where downloaded feature matrices and snapshots are kept "
+                                            "(default: per-user ~/.cache/bukit_vista)")
+
+
+def load_recommender(args):
+    if args.source:
+        return Recommender.from_source(open_source(args.source), args.cache_dir or default_cache_dir())
+    return Recommender.from_files(args.data, args.features)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m recommender", description="Bukit Vista property recommender")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    query = subparsers.add_parser("query", help="Recommend properties for an area and property type")
+    add_data_arguments(query)
+    query.add_argument("--area", required=True, help="Area to recommend for")
+    query.add_argument("--type", dest="property_type", required=True, help="Property type to recommend for")
+    query.add_argument("--top-n", type=int, default=4, help="Number of recommendations (default: 4)")
+    query.add_argument("--mode", choices=RECOMMENDATION_MODES, default="first", help="Reference mode (default: first)")
+    query.add_argument("--exclude-group", action="store_true", help="Exclude the reference group from the results (always on for --mode max)")
+    query.add_argument("--json", action="store_true", help="Print results as JSON records")
+    query.add_argument("--timing", action="store_true", help="Print load and query latency to stderr")
+
+    serve = subparsers.add_parser("serve", help="Run the local HTTP recommendation service")
+    add_data_arguments(serve)
+    serve.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1)")
+    serve.add_argument("--port", type=int, default=8000, help="Bind port (default: 8000)")
+    serve.add_argument("--refresh-interval", type=float, default=300,
+                       help="Seconds between checks for a newer data file with --source; 0 disables (default: 300)")
+    return parser
+
+
+def run_query(args):
+    start = time.perf_counter()
+    recommender = load_recommender(args)    # Load data dan bangun indeks
+    loaded = time.perf_counter()
+    recommended = recommender.recommend(args.area, args.property_type, args.top_n, args.mode, args.exclude_group)
+    queried = time.perf_counter()
+
+    if args.timing:    # Latensi cold start dan query dicetak ke stderr agar tidak mengganggu output
+        print(f"load+index: {(loaded - start) * 1000:.1f} ms, query: {(queried - loaded) * 1000:.3f} ms", file=sys.stderr)
+
+    if recommended.empty:
+        print("No properties found for this selection", file=sys.stderr)
+        return 1
+    if args.json:
+        print(recommended.to_json(orient="records", force_ascii=False))
+    else:
+        print(recommended.to_string(index=False))
+    return 0
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == "query":
+        return run_query(args)
+    if args.command == "serve":
+        from .service import serve    # Diimpor saat dibutuhkan agar query tidak memerlukan uvicorn
+        source = open_source(args.source) if args.source else None
+        serve(args.data, args.features, args.host, args.port, source=source, cache_dir=args.cache_dir or default_cache_dir(),
+              refresh_interval=args.refresh_interval)
+        return 0
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
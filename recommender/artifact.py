@@ -0,0 +1,77 @@
+"""Membaca artefak data hasil scraper: metadata (Parquet/Excel) dan matriks fitur (.npy/.npz)."""
+import io       # Mengimpor io
+import json     # Mengimpor json untuk membaca manifest artefak
+import os       # Mengimpor os
+import re       # Mengimpor re
+import numpy as np      # Mengimpor numpy untuk operasi numerik
+import pandas as pd     # Mengimpor pandas untuk manipulasi data
+from scipy import sparse      # Mengimpor scipy.sparse untuk matriks fitur sparse (CSR)
+
+# Scraper menyimpan metadata properti sebagai Parquet (data_bukit_vista_<tanggal>.parquet) dan matriks fitur
+# sparse float32 sebagai komponen CSR .npy terpisah (features_bukit_vista_<tanggal>.<data|indices|indptr>.npy)
+# agar tetap sparse dan bisa di-mmap. Artefak versi 1 menyimpan matriks dense (features_bukit_vista_<tanggal>.npy).
+# Versi format, nama file dan tata letak fitur disimpan di metadata skema Parquet.
+ARTIFACT_VERSION = 2    # Versi format artefak terbaru
+SUPPORTED_ARTIFACT_VERSIONS = (1, 2)    # Versi format artefak yang masih bisa dibaca aplikasi
+FEATURE_PARTS = ("data", "indices", "indptr")    # Komponen CSR matriks fitur (artefak versi 2)
+ARTIFACT_METADATA_KEY = b"bukit_vista_artifact"    # Kunci metadata skema Parquet
+DATA_FILE_PATTERN = re.compile(r"data_bukit_vista_(\d{2}-\d{2}-\d{4})\.(parquet|xlsx)")    # Pola nama file data
+
+# Fungsi untuk membaca manifest artefak dari metadata skema Parquet
+def read_artifact_manifest(table):
+    metadata = table.schema.metadata or {}
+    if ARTIFACT_METADATA_KEY not in metadata:
+        raise ValueError("Parquet file is missing the bukit_vista_artifact manifest.")
+    manifest = json.loads(metadata[ARTIFACT_METADATA_KEY])
+    if manifest.get("artifact_version") not in SUPPORTED_ARTIFACT_VERSIONS:    # Tolak format yang tidak dikenal
+        raise ValueError(
+            f"Unsupported artifact version {manifest.get('artifact_version')} (expected one of {SUPPORTED_ARTIFACT_VERSIONS})."
+        )
+    return manifest
+
+# Fungsi untuk membaca manifest dari file data (path atau bytes) tanpa membaca isi tabel; None untuk file Excel lama
+def read_data_manifest(source, file_name):
+    if not file_name.endswith(".parquet"):
+        return None
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    import pyarrow.parquet as pq    # Mengimpor pyarrow hanya saat membaca file Parquet
+    return read_artifact_manifest(pq.read_table(source, columns=[]))    # Tanpa kolom: hanya metadata yang dibaca
+
+# Fungsi untuk membaca file data (path atau bytes) menjadi DataFrame berdasarkan ekstensi nama file
+def read_property_table(source, file_name):
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)    # Bytes hasil download dibaca dari memori
+
+    if file_name.endswith(".parquet"):
+        import pyarrow.parquet as pq    # Mengimpor pyarrow hanya saat membaca file Parquet
+        table = pq.read_table(source)    # Baca file Parquet
+        read_artifact_manifest(table)    # Validasi versi artefak
+        return table.to_pandas()    # Ubah ke dataframe
+    return pd.read_excel(source, dtype={"price_info": str})    # Baca file Excel lama ke dataframe
+
+# Fungsi untuk menentukan nama file fitur pendamping dari nama file data (tata letak artefak versi 1 / Excel lama)
+def feature_file_name(file_name):
+    match = DATA_FILE_PATTERN.match(os.path.basename(file_name or ""))    # Ambil tanggal dari nama file
+    if match is None:
+        return None
+    date, extension = match.groups()
+    if extension == "parquet":
+        return f"features_bukit_vista_{date}.npy"    # Artefak versi 1: matriks float32 dense
+    return f"features_bukit_vista_{date}.npz"    # File Excel lama: matriks sparse (jika ada)
+
+# Fungsi untuk menentukan semua file fitur pendamping: dari manifest (artefak versi 2) atau dari nama file data
+def feature_file_names(file_name, manifest=None):
+    if manifest is not None and "features_files" in manifest:
+        return [manifest["features_files"][part] for part in FEATURE_PARTS]
+    name = feature_file_name(file_name)
+    return [name] if name else []
+
+# Fungsi untuk memuat matriks fitur dari disk: satu file (.npy/.npz) atau daftar komponen CSR (FEATURE_PARTS)
+def load_feature_matrix(path, shape=None):
+    if isinstance(path, (list, tuple)):    # Komponen CSR terpisah, semuanya dibaca lewat mmap
+        parts = [np.load(part, mmap_mode="r") for part in path]
+        return sparse.csr_matrix(tuple(parts), shape=tuple(shape) if shape else None)
+    if path.endswith(".npy"):
+        return np.load(path, mmap_mode="r")    # Dibaca zero-copy lewat mmap
+    return sparse.load_npz(path).tocsr()    # Baca sebagai matriks CSR
@@ -0,0 +1,181 @@
+"""Recommender: memuat data, membangun indeks, lalu menjawab query rekomendasi tanpa Streamlit."""
+import os       # Mengimpor os
+import warnings     # Mengimpor warnings untuk peringatan snapshot yang gagal ditulis
+import numpy as np      # Mengimpor numpy untuk operasi numerik
+import pandas as pd     # Mengimpor pandas untuk manipulasi data
+
+from .artifact import feature_file_names, load_feature_matrix, read_data_manifest, read_property_table
+from .features import VECTOR_COLUMNS, decode_vector_columns
+from .index import PartitionIndex, SimilarityIndex
+from .snapshot import load_snapshot, save_snapshot, snapshot_dir
+from .sources import fetch_feature_file
+
+RECOMMENDATION_MODES = ("first", "centroid", "max")    # Mode rekomendasi yang didukung
+RESULT_COLUMNS = ["title", "image_url", "price_info", "area", "property_type"]    # Kolom hasil rekomendasi
+
+
+# Fungsi untuk mengambil ukuran matriks fitur dari manifest artefak (None jika tidak dicatat)
+def feature_shape(manifest):
+    return manifest.get("features_shape") if manifest else None
+
+
+class Recommender:
+    """Sistem rekomendasi properti: load -> build index -> query.
+
+    ``features`` adalah matriks fitur yang barisnya sejajar dengan ``df``
+    (array dense, memmap, atau ``scipy.sparse``). Jika tidak diberikan,
+    fitur di-decode dari kolom vektor lama di dalam ``df``. ``name`` adalah
+    nama file data asal (versi dataset). ``cache_files`` berisi file dan
+    folder di cache yang dibuat untuk dataset ini (diisi oleh ``from_source``).
+    """
+
+    def __init__(self, df, features=None, name=None):
+        self.name = name
+        self.cache_files = []    # Download dan snapshot di cache_dir milik dataset ini
+        self.df = df.reset_index(drop=True)    # Posisi baris = label index
+        self.df["price_info"] = self.df["price_info"].fillna(0)     # Mengisi nilai NaN dengan 0 pada kolom harga
+
+        self.malformed_rows = {}    # Baris rusak per kolom vektor (hanya untuk file lama)
+        if features is None:
+            # File lama: vektor disimpan sebagai list di dalam sel Excel
+            features, self.malformed_rows = decode_vector_columns(self.df, VECTOR_COLUMNS)
+        elif features.shape[0] != len(self.df):    # Jumlah baris harus sama dengan dataframe
+            raise ValueError(f"Feature matrix has {features.shape[0]} rows but the data has {len(self.df)}.")
+
+        self.similarity_index = SimilarityIndex(features)    # Indeks kemiripan kosinus antar properti
+        self.partition_index = PartitionIndex(self.df)    # Indeks (area, property_type)
+
+    @classmethod
+    def from_files(cls, data_path, features_path=None):
+        # Muat dari file lokal; file fitur dicari di folder yang sama jika tidak diberikan
+        df = read_property_table(data_path, data_path)
+        manifest = read_data_manifest(data_path, data_path)
+        if features_path is None:
+            names = feature_file_names(data_path, manifest)
+            candidates = [os.path.join(os.path.dirname(data_path), name) for name in names]
+            missing = [name for name, candidate in zip(names, candidates) if not os.path.exists(candidate)]
+            if candidates and not missing:
+                features_path = candidates if len(candidates) > 1 else candidates[0]
+            elif data_path.endswith(".parquet"):    # Artefak Parquet wajib punya matriks fitur
+                raise FileNotFoundError(f"{', '.join(missing or names)} not found next to {data_path}.")
+        features = load_feature_matrix(features_path, feature_shape(manifest)) if features_path else None
+        return cls(df, features, name=os.path.basename(data_path))
+
+    @classmethod
+    def from_snapshot(cls, state):
+        # Pulihkan recommender dari state snapshot (lihat snapshot.load_snapshot) tanpa memproses ulang data
+        recommender = cls.__new__(cls)
+        recommender.name = state["name"]
+        recommender.cache_files = []
+        recommender.df = state["df"]
+        recommender.malformed_rows = state["malformed_rows"]
+        recommender.similarity_index = SimilarityIndex.from_arrays(state["vectors"], state["inv_norms"])
+        recommender.partition_index = state["partition_index"]
+        return recommender
+
+    @classmethod
+    def from_source(cls, source, cache_dir, latest=None, snapshots=True):
+        # Muat file data (default: terbaru) dari DataSource; matriks fitur disalin ke cache_dir bila perlu (untuk mmap).
+        # snapshots=False: selalu diproses ulang, tanpa membaca atau menulis snapshot
+        latest = latest or source.latest_data_file()
+        if latest is None:
+            raise FileNotFoundError("No data_bukit_vista_<dd-mm-yyyy> file found in the data source.")
+        content = source.read_bytes(latest["id"])
+        manifest = read_data_manifest(content, latest["name"])
+        features_path = fetch_feature_file(source, latest["name"], cache_dir, manifest)
+
+        # Snapshot per (nama file, hash isi, versi file fitur): proses baru langsung memakai hasil pemrosesan yang sudah ada
+        directory = snapshot_dir(cache_dir, latest["name"], content, features_path) if snapshots else None
+        state = load_snapshot(directory) if directory else None
+        if state is not None:
+            recommender = cls.from_snapshot(state)
+        else:
+            df = read_property_table(content, latest["name"])
+            features = load_feature_matrix(features_path, feature_shape(manifest)) if features_path else None
+            recommender = cls(df, features, name=latest["name"])
+            if directory is not None:
+                try:
+                    save_snapshot(recommender, directory)
+                except OSError as e:    # Snapshot hanya optimasi; recommender tetap dipakai walau cache_dir tidak bisa ditulis
+                    warnings.warn(f"Could not write recommender snapshot {directory}: {e}")
+
+        # Catat file yang dibuat di cache_dir untuk dataset ini (file sumber lokal yang dibaca langsung tidak termasuk)
+        paths = features_path if isinstance(features_path, list) else [features_path] if features_path else []
+        recommender.cache_files = [path for path in paths
+                                   if os.path.dirname(os.path.abspath(path)) == os.path.abspath(cache_dir)]
+        if directory is not None and os.path.isdir(directory):
+            recommender.cache_files.append(directory)
+        return recommender
+
+    @property
+    def areas(self):
+        return self.partition_index.areas    # Pilihan area (urutan kemunculan)
+
+    @property
+    def property_types(self):
+        return self.partition_index.property_types    # Pilihan tipe properti (urutan kemunculan)
+
+    def recommend(self, selected_area, selected_property_type, top_n=4, mode="first", exclude_group=False):
+        # mode="first"    : kemiripan terhadap properti pertama dalam kelompok (perilaku awal)
+        # mode="centroid" : kemiripan terhadap centroid seluruh properti dalam kelompok
+        # mode="max"      : skor kemiripan tertinggi terhadap salah satu properti dalam kelompok
+        #                   (anggota kelompok selalu dikecualikan: skornya 1.0 terhadap dirinya sendiri)
+        # Mengembalikan DataFrame kosong jika tidak ada properti untuk pilihan tersebut
+        if mode not in RECOMMENDATION_MODES:
+            raise ValueError(f"Unknown recommendation mode {mode!r}; expected one of {RECOMMENDATION_MODES}.")
+
+        # Ambil posisi baris berdasarkan area dan property type dari partition index
+        group_rows = self.partition_index.rows(selected_area, selected_property_type)
+
+        if len(group_rows) == 0:    # Jika hasil kosong
+            return self.df.iloc[[]][RESULT_COLUMNS].assign(similarity_score=np.array([], dtype=np.float32))
+
+        exclude = group_rows if exclude_group else None    # Kecualikan anggota kelompok referensi jika diminta
+        if mode == "first":
+            # Menggunakan properti pertama sebagai referensi untuk rekomendasi
+            reference_index = group_rows[0]    # Ambil properti pertama sebagai acuan
+            similar_indices, scores = self.similarity_index.top_k(reference_index, top_n, exclude=exclude)
+        elif mode == "centroid":
+            scores = self.similarity_index.centroid_scores(group_rows)    # Skor terhadap centroid kelompok
+            similar_indices, scores = self.similarity_index.select_top(scores, top_n, exclude=exclude)
+        else:
+            scores = self.similarity_index.max_scores(group_rows)    # Skor maksimum terhadap anggota kelompok
+            similar_indices, scores = self.similarity_index.select_top(scores, top_n, exclude=group_rows)
+
+        recommended = self.df.iloc[similar_indices][RESULT_COLUMNS]
+        return recommended.assign(similarity_score=scores)    # Kembalikan data rekomendasi beserta skornya
+
+    def recommend_batch(self, queries):
+        """Rekomendasi untuk banyak kombinasi (area, property_type, top_n) sekaligus.
+
+        Baris referensi semua kombinasi diambil dari partition index dan skor
+        kemiripannya dihitung sekaligus, lalu top-k tiap baris dipilih dengan
+        aturan yang sama seperti ``recommend`` (mode "first"), sehingga hasilnya
+        sama persis dengan memanggil ``recommend`` per kombinasi. Hasilnya satu
+        DataFrame rapi (satu baris per rekomendasi); kombinasi tanpa properti
+        tidak menghasilkan baris.
+        """
+        queries = [(area, property_type, top_n) for area, property_type, top_n in queries]
+        found = [(q, self.partition_index.rows(q[0], q[1])) for q in queries]
+        found = [(q, rows[0]) for q, rows in found if len(rows)]    # Properti pertama tiap kelompok sebagai referensi
+
+        columns = ["query_area", "query_property_type", "rank"] + RESULT_COLUMNS + ["similarity_score"]
+        if not found:
+            return pd.DataFrame(columns=columns)
+
+        reference_indices = np.array([reference for _, reference in found])
+        max_top_n = max(q[2] for q, _ in found)
+        similar_indices, scores = self.similarity_index.batch_top_k(reference_indices, max_top_n)
+
+        # Susun hasil menjadi tabel panjang: satu baris per (kombinasi, peringkat)
+        top_ns = np.array([min(q[2], similar_indices.shape[1]) for q, _ in found])
+        ranks = np.arange(similar_indices.shape[1])
+        keep = ranks[None, :] < top_ns[:, None]    # Potong sesuai top_n masing-masing kombinasi
+        query_positions = np.nonzero(keep)[0]
+
+        recommended = self.df.iloc[similar_indices[keep]][RESULT_COLUMNS].reset_index(drop=True)
+        recommended.insert(0, "query_area", [found[i][0][0] for i in query_positions])
+        recommended.insert(1, "query_property_type", [found[i][0][1] for i in query_positions])
+        recommended.insert(2, "rank", np.nonzero(keep)[1] + 1)
+        recommended["similarity_score"] = scores[keep]
+        return recommended[columns]
@@ -0,0 +1,50 @@
+"""Decoder kolom vektor lama (list di dalam sel Excel) menjadi satu matriks float32."""
+import json     # Mengimpor json untuk parsing array vektor
+import numpy as np      # Mengimpor numpy untuk operasi numerik
+import pandas as pd     # Mengimpor pandas untuk manipulasi data
+
+# Kolom vektor yang digabungkan menjadi matriks fitur (urutan harus sama dengan scraper)
+VECTOR_COLUMNS = ['title_vectorizer', 'property_type_vectorizer', 'tags_vectorizer', 'area_vectorizer']
+
+
+# Fungsi untuk membaca tata letak satu kolom vektor (teks "[x, y, ...]" di tiap sel) tanpa parsing angka
+def vector_column_layout(values):
+    text = pd.Series(values, dtype=object).reset_index(drop=True).str.strip()    # Sel non-string menjadi NaN
+    bracketed = text.str.startswith("[", na=False) & text.str.endswith("]", na=False)    # Sel berbentuk list
+    widths = text.str.count(",") + 1    # Jumlah elemen tiap sel dihitung dari jumlah koma
+    width = int(widths[bracketed].mode().iloc[0]) if bracketed.any() else 0    # Lebar yang dipakai mayoritas baris
+    valid = (bracketed & (widths == width)).to_numpy(copy=True)    # Sel dengan lebar berbeda dianggap rusak
+    return text, valid, width
+
+# Fungsi untuk mengisi satu blok kolom matriks dari teks vektor dalam satu kali parsing JSON
+def fill_vector_block(out, text, valid):
+    rows = np.flatnonzero(valid)
+    if len(rows) == 0:
+        return valid
+    bodies = text.iloc[rows].str.slice(1, -1)    # Buang tanda kurung siku
+    try:
+        # Seluruh kolom di-parse sekaligus sebagai satu array JSON
+        out[rows] = np.array(json.loads("[" + ",".join(bodies) + "]"), dtype=np.float32).reshape(len(rows), -1)
+    except (ValueError, TypeError):
+        # Ada sel yang bukan angka: parse per baris hanya untuk mencari baris yang rusak
+        for row, body in zip(rows, bodies):
+            try:
+                out[row] = np.array(json.loads("[" + body + "]"), dtype=np.float32)
+            except (ValueError, TypeError):
+                out[row] = 0.0
+                valid[row] = False
+    return valid
+
+# Fungsi untuk mengubah beberapa kolom vektor menjadi satu matriks float32 yang dialokasikan sekali
+def decode_vector_columns(df, columns):
+    layouts = [vector_column_layout(df[col]) for col in columns]    # Tentukan lebar tiap kolom terlebih dahulu
+    features = np.zeros((len(df), sum(width for _, _, width in layouts)), dtype=np.float32)    # Matriks hasil
+
+    malformed = {}    # Baris rusak per kolom: {kolom: array posisi baris}
+    offset = 0
+    for col, (text, valid, width) in zip(columns, layouts):
+        valid = fill_vector_block(features[:, offset:offset + width], text, valid)    # Isi blok kolom secara langsung
+        if not valid.all():
+            malformed[col] = np.flatnonzero(~valid)    # Baris rusak tetap bernilai nol dengan lebar yang benar
+        offset += width
+    return features, malformed
@@ -0,0 +1,148 @@
+"""Struktur indeks untuk rekomendasi: kemiripan kosinus top-k dan partisi (area, property_type)."""
+import numpy as np      # Mengimpor numpy untuk operasi numerik
+import pandas as pd     # Mengimpor pandas untuk manipulasi data
+from scipy import sparse      # Mengimpor scipy.sparse untuk matriks fitur sparse (CSR)
+
+
+class SimilarityIndex:
+    """Indeks kemiripan kosinus top-k tanpa membangun matriks N x N.
+
+    Norma L2 tiap vektor dihitung sekali saat dibuat, sehingga skor kosinus
+    satu properti terhadap seluruh katalog cukup dihitung dengan satu
+    perkalian matriks-vektor, lalu diambil top-k dengan ``np.partition``.
+    Fitur boleh berupa array dense (termasuk hasil ``np.load(mmap_mode='r')``,
+    yang tidak disalin) maupun matriks ``scipy.sparse``; matriks sparse tetap
+    sparse sehingga biaya memori mengikuti jumlah non-zero.
+
+    Vektor disimpan float32, tetapi norma dan skor dihitung dalam float64
+    (seperti ``cosine_similarity`` pada implementasi lama), sehingga baris
+    fitur yang identik selalu mendapat skor yang persis sama. Urutan hasil
+    deterministik: skor tertinggi lebih dulu, skor sama diurutkan dari posisi
+    baris terkecil.
+    """
+
+    def __init__(self, features):
+        if sparse.issparse(features):
+            self.vectors = sparse.csr_matrix(features, dtype=np.float32)    # Simpan sebagai CSR float32
+            squared = self.vectors.astype(np.float64).multiply(self.vectors).sum(axis=1)
+            norms = np.sqrt(np.asarray(squared, dtype=np.float64).ravel())    # Norma L2 tiap baris (float64)
+        else:
+            self.vectors = np.asarray(features, dtype=np.float32)    # Float32 hemat memori; memmap float32 tidak disalin
+            norms = np.sqrt(np.einsum("nd,nd->n", self.vectors, self.vectors, dtype=np.float64))    # Norma L2 tiap baris (float64)
+        norms[norms == 0] = 1.0    # Baris nol tetap nol (sama seperti cosine_similarity sklearn)
+        self.inv_norms = 1.0 / norms    # Faktor normalisasi L2 tiap baris (float64)
+
+    @classmethod
+    def from_arrays(cls, vectors, inv_norms):
+        # Pulihkan indeks dari array yang sudah dihitung (mis. dari snapshot) tanpa menghitung ulang norma
+        index = cls.__new__(cls)
+        index.vectors = vectors
+        index.inv_norms = inv_norms
+        return index
+
+    def __len__(self):
+        return self.vectors.shape[0]    # Jumlah properti di dalam indeks
+
+    def dots(self, vector):
+        # Perkalian titik float64 semua properti dengan satu vektor dense; per baris urutan penjumlahannya sama,
+        # sehingga baris identik menghasilkan nilai yang persis sama (tidak bergantung pada kernel BLAS)
+        if sparse.issparse(self.vectors):
+            return self.vectors @ vector    # CSR x vektor float64: loop per baris di scipy
+        return np.einsum("nd,d->n", self.vectors, vector, dtype=np.float64)
+
+    def batch_dots(self, vectors):
+        # Seperti dots untuk beberapa vektor sekaligus (hasil N x Q); nilainya persis sama dengan dots per vektor
+        if sparse.issparse(self.vectors):
+            return np.asarray(self.vectors @ vectors.T)    # CSR x matriks: tiap kolom dihitung seperti CSR x vektor
+        return np.column_stack([self.dots(vector) for vector in vectors]) if len(vectors) else np.empty((len(self), 0))
+
+    def scores(self, index):
+        # Skor kosinus properti `index` terhadap semua properti (satu baris similarity_matrix);
+        # lewat batch_scores agar hasil per query dan batch dihitung dengan rumus yang sama persis
+        return self.batch_scores([index])[0]
+
+    def normalized_rows(self, rows):
+        # Vektor referensi (dense, float64) yang sudah dinormalisasi L2
+        refs = self.vectors[rows]
+        if sparse.issparse(refs):
+            refs = refs.toarray()
+        return np.asarray(refs, dtype=np.float64) * np.asarray(self.inv_norms)[rows][:, None]
+
+    def centroid_scores(self, rows):
+        # Skor kosinus semua properti terhadap centroid vektor referensi (satu perkalian matriks-vektor)
+        centroid = self.normalized_rows(rows).mean(axis=0)
+        norm = np.linalg.norm(centroid)
+        if norm == 0:
+            return np.zeros(len(self))
+        return self.dots(centroid / norm) * self.inv_norms
+
+    def max_scores(self, rows):
+        # Skor maksimum tiap properti terhadap beberapa referensi; baris referensi sendiri (skor 1.0 terhadap
+        # dirinya) harus dikecualikan pemanggil agar hasilnya bukan anggota kelompok itu sendiri
+        return self.batch_dots(self.normalized_rows(rows)).max(axis=1) * self.inv_norms
+
+    @staticmethod
+    def select_top(scores, k, exclude=None):
+        # Ambil k skor tertinggi; `exclude` berisi posisi baris yang tidak boleh masuk hasil.
+        # Aturan urutan: skor tertinggi dulu; skor sama -> posisi baris terkecil dulu
+        exclude = np.unique(np.asarray(exclude if exclude is not None else [], dtype=np.intp))
+        if len(exclude):
+            scores = scores.copy()
+            scores[exclude] = -np.inf    # Baris yang dikecualikan diletakkan paling akhir
+        n_take = min(k, len(scores) - len(exclude))
+        if n_take <= 0:
+            return np.array([], dtype=np.intp), np.array([], dtype=scores.dtype)
+        # Skor ke-k tanpa mengurutkan seluruh baris; semua baris dengan skor >= batas itu ikut diurutkan
+        # agar pemenang di antara skor yang sama tidak bergantung pada argpartition
+        threshold = -np.partition(-scores, n_take - 1)[n_take - 1]
+        candidates = np.flatnonzero(scores >= threshold)    # Posisi baris menaik
+        order = np.lexsort((candidates, -scores[candidates]))[:n_take]
+        candidates = candidates[order]
+        return candidates, scores[candidates]
+
+    def top_k(self, index, k, exclude=None):
+        # Ambil k properti paling mirip dengan `index`; properti itu sendiri tidak pernah ikut
+        exclude = np.append(np.asarray(exclude if exclude is not None else [], dtype=np.intp), index)
+        return self.select_top(self.scores(index), k, exclude=exclude)
+
+    def batch_scores(self, indices):
+        # Skor kosinus beberapa properti sekaligus (Q x N): vektor referensi dinormalisasi, dikalikan, lalu dikali
+        # norma invers tiap properti. Satu-satunya rumus skor per referensi, dipakai juga oleh scores()
+        return self.batch_dots(self.normalized_rows(indices)).T * self.inv_norms
+
+    def batch_top_k(self, indices, k):
+        # Top-k untuk banyak properti referensi: skor dihitung sekaligus, lalu tiap baris dipilih dengan
+        # select_top (aturan urutan yang sama dengan top_k), properti referensi sendiri dikecualikan
+        scores = self.batch_scores(indices)
+        selected = [self.select_top(row, k, exclude=[index]) for index, row in zip(indices, scores)]
+        n_take = max(min(k, len(self) - 1), 0)    # Panjang hasil sama untuk semua referensi
+        candidates = np.array([c for c, _ in selected], dtype=np.intp).reshape(len(indices), n_take)
+        candidate_scores = np.array([s for _, s in selected], dtype=np.float64).reshape(len(indices), n_take)
+        return candidates, candidate_scores
+
+
+class PartitionIndex:
+    """Pemetaan (area, property_type) ke posisi baris, dibangun sekali per dataset.
+
+    Area dan tipe properti diubah menjadi kode kategori dengan ``pd.factorize``
+    (urutan kemunculan sama dengan ``unique()``), lalu baris dikelompokkan
+    dengan satu sort stabil. Filter saat rekomendasi cukup satu akses dictionary.
+    """
+
+    def __init__(self, df):
+        self.area_codes, self.areas = pd.factorize(df["area"], use_na_sentinel=False)    # Kode kategori area
+        self.type_codes, self.property_types = pd.factorize(df["property_type"], use_na_sentinel=False)    # Kode kategori tipe
+
+        # Gabungkan kedua kode menjadi satu kunci lalu kelompokkan dengan sort stabil (urutan baris tetap terjaga)
+        keys = self.area_codes.astype(np.int64) * len(self.property_types) + self.type_codes
+        order = np.argsort(keys, kind="stable")
+        boundaries = np.flatnonzero(np.diff(keys[order])) + 1    # Batas antar kelompok
+        self.groups = {}
+        for rows in np.split(order, boundaries):
+            if len(rows):
+                key = (self.areas[self.area_codes[rows[0]]], self.property_types[self.type_codes[rows[0]]])
+                self.groups[key] = rows    # Posisi baris untuk pasangan (area, property_type)
+
+    def rows(self, area, property_type):
+        # Posisi baris untuk pasangan (area, property_type), array kosong jika tidak ada
+        return self.groups.get((area, property_type), np.array([], dtype=np.intp))
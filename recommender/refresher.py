@@ -0,0 +1,134 @@
+"""Refresh dataset di background: file data terbaru dipantau dan recommender ditukar tanpa downtime.
+
+Polling hanya membaca daftar file (ID, nama, ``modifiedTime``), sehingga
+murah. Jika file data terbaru berbeda dari yang sedang dipakai, file baru
+di-download dan indeksnya dibangun di thread background (memakai snapshot
+jika ada), lalu ``current`` diganti dengan satu assignment. Request yang
+sedang berjalan tetap memakai ``LoadedDataset`` lama sampai selesai.
+Setelah ditukar, download dan snapshot dataset lama dihapus dari cache.
+"""
+import datetime     # Mengimpor datetime untuk parsing modifiedTime
+import os       # Mengimpor os
+import shutil       # Mengimpor shutil untuk menghapus folder snapshot lama
+import threading        # Mengimpor threading untuk thread polling dan lock refresh
+import time     # Mengimpor time untuk waktu load dan umur dataset
+
+from .core import Recommender
+
+
+class LoadedDataset:
+    """Recommender beserta versi file data asalnya (ID, nama, modifiedTime) dan waktu load."""
+
+    def __init__(self, recommender, file, loaded_at=None):
+        self.recommender = recommender
+        self.file = file    # {"id", "name", "modifiedTime"} dari DataSource
+        self.loaded_at = loaded_at or time.time()
+
+    @property
+    def version(self):
+        # Versi dataset: berubah jika file diganti (ID/nama) atau ditimpa (modifiedTime)
+        return file_version(self.file)
+
+    @property
+    def modified_at(self):
+        # Waktu modifikasi file data (epoch detik), None jika sumber tidak melaporkannya
+        modified = self.file.get("modifiedTime")
+        return datetime.datetime.fromisoformat(modified).timestamp() if modified else None
+
+    def age(self, now=None):
+        # Umur dataset dalam detik, dihitung dari modifiedTime file (atau waktu load jika tidak ada)
+        return (now or time.time()) - (self.modified_at or self.loaded_at)
+
+    def describe(self):
+        return {
+            "dataset": self.file["name"],
+            "modified_time": self.file.get("modifiedTime"),
+            "age_seconds": round(self.age(), 1),
+            "rows": len(self.recommender.df),
+            "loaded_at": self.loaded_at,
+        }
+
+
+# Fungsi untuk membuat kunci versi dari metadata file
+def file_version(file):
+    return file["id"], file["name"], file.get("modifiedTime")
+
+# Fungsi untuk menghapus file/folder cache dataset lama yang tidak dipakai dataset baru. File yang sudah di-mmap
+# tetap bisa dibaca request yang masih berjalan; file yang gagal dihapus (misalnya terkunci di Windows) dilewati.
+def remove_cache_files(paths, keep=()):
+    for path in set(paths) - set(keep):
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class Refresher:
+    """Memantau DataSource setiap ``interval`` detik dan menukar dataset saat file data terbaru berubah."""
+
+    def __init__(self, source, cache_dir, interval=300, snapshots=True):
+        self.source = source
+        self.cache_dir = cache_dir
+        self.interval = interval
+        self.snapshots = snapshots    # False: dataset selalu diproses ulang tanpa snapshot di cache_dir
+        self.current = None    # LoadedDataset yang sedang dipakai; diganti utuh saat refresh
+        self.checked_at = None    # Waktu polling terakhir
+        self.last_error = None    # Pesan error refresh terakhir (dataset lama tetap dipakai)
+        self._lock = threading.Lock()    # Hanya satu refresh dalam satu waktu
+        self._stop = threading.Event()
+        self._thread = None
+
+    def refresh(self, force=False):
+        # Cek file data terbaru; bangun dan tukar dataset jika versinya berubah (atau force). True jika ditukar
+        with self._lock:
+            latest = self.source.latest_data_file()    # Hanya metadata, tanpa download
+            self.checked_at = time.time()
+            if latest is None:
+                raise FileNotFoundError("No data_bukit_vista_<dd-mm-yyyy> file found in the data source.")
+            current = self.current
+            if not force and current is not None and current.version == file_version(latest):
+                return False
+
+            recommender = Recommender.from_source(self.source, self.cache_dir, latest=latest, snapshots=self.snapshots)    # Di luar request path
+            self.current = LoadedDataset(recommender, latest)    # Swap atomik: satu assignment
+            self.last_error = None
+            if current is not None:    # Download dan snapshot versi lama tidak dibutuhkan lagi
+                remove_cache_files(current.recommender.cache_files, keep=recommender.cache_files)
+            return True
+
+    def poll(self):
+        # Satu kali refresh untuk thread background: error dicatat, dataset lama tetap dipakai
+        try:
+            return self.refresh()
+        except Exception as e:
+            self.last_error = f"{type(e).__name__}: {e}"
+            return False
+
+    def start(self, load=True):
+        # Muat dataset pertama (jika load) lalu jalankan thread polling daemon
+        if load and self.current is None:
+            self.poll()
+        if self._thread is None and self.interval:
+            self._thread = threading.Thread(target=self._run, name="dataset-refresher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.poll()
+
+    def status(self):
+        # Versi dan umur dataset yang sedang dipakai beserta hasil polling terakhir
+        current = self.current
+        status = current.describe() if current is not None else {"dataset": None}
+        status.update({"checked_at": self.checked_at, "last_error": self.last_error})
+        return status
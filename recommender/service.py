@@ -0,0 +1,158 @@
+"""Layanan HTTP (ASGI) untuk rekomendasi properti, dijalankan lokal dengan data dari disk.
+
+Endpoint:
+    GET  /healthz    status layanan, versi dan umur dataset yang sedang dipakai
+    GET  /recommend  ?area=...&type=...[&top_n=4&mode=first&exclude_group=0]
+    POST /reload     muat ulang data (file terbaru jika memakai DataSource) lalu tukar indeks secara atomik
+
+Dengan DataSource dan ``refresh_interval``, file data terbaru juga dipantau
+di background (lihat ``Refresher``) dan dataset baru ditukar tanpa restart.
+"""
+import asyncio      # Mengimpor asyncio untuk handler async dan lock reload
+import json     # Mengimpor json untuk respons JSON
+import os       # Mengimpor os
+from urllib.parse import parse_qs       # Mengimpor parse_qs untuk membaca query string
+
+from .core import RECOMMENDATION_MODES, Recommender
+from .refresher import LoadedDataset, Refresher
+
+
+class RecommenderService:
+    """Aplikasi ASGI yang memuat dataset dan indeks sekali per proses."""
+
+    def __init__(self, data_path=None, features_path=None, source=None, cache_dir=None, refresh_interval=None):
+        # Data dibaca dari satu file (data_path) atau dari file terbaru di DataSource (source)
+        self.data_path = data_path
+        self.features_path = features_path
+        self.source = source
+        self.cache_dir = cache_dir
+        # Dataset dari DataSource dikelola Refresher (polling background jika refresh_interval diisi)
+        self.refresher = Refresher(source, cache_dir, interval=refresh_interval) if source is not None else None
+        self.dataset = None    # LoadedDataset untuk mode data_path
+        self._reload_lock = None    # Dibuat di dalam event loop
+
+    @property
+    def current(self):
+        # LoadedDataset yang sedang dipakai; diganti utuh saat reload sehingga handler melihat satu versi yang konsisten
+        return self.refresher.current if self.refresher is not None else self.dataset
+
+    @property
+    def recommender(self):
+        current = self.current
+        return current.recommender if current is not None else None
+
+    def load(self):
+        # Bangun recommender baru di luar request path, lalu tukar referensinya (atomik untuk handler lain)
+        if self.refresher is not None:
+            self.refresher.refresh(force=True)    # Pilih file terbaru saat reload
+        else:
+            recommender = Recommender.from_files(self.data_path, self.features_path)
+            self.dataset = LoadedDataset(recommender, {"id": self.data_path, "name": os.path.basename(self.data_path)})
+        return self.recommender
+
+    async def reload(self):
+        if self._reload_lock is None:
+            self._reload_lock = asyncio.Lock()
+        async with self._reload_lock:    # Hanya satu reload dalam satu waktu
+            await asyncio.to_thread(self.load)    # Build indeks di thread agar request lain tetap dilayani
+
+    def health(self):
+        current = self.current
+        health = {"status": "ok" if current is not None else "loading"}
+        if self.refresher is not None:
+            health.update(self.refresher.status())    # Versi, umur dataset dan hasil polling terakhir
+        elif current is not None:
+            health.update(current.describe())
+        else:
+            health["dataset"] = None
+        return health
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            status, body = await self._dispatch(scope)
+            await send_json(send, status, body)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await self.reload()    # Dataset dimuat sekali saat proses mulai
+                except Exception as e:
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+                if self.refresher is not None:
+                    self.refresher.start(load=False)    # Polling file data terbaru di background
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self.refresher is not None:
+                    self.refresher.stop()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _dispatch(self, scope):
+        path, method = scope["path"], scope["method"]
+        if path == "/healthz":
+            return 200, self.health()
+        if path == "/reload":
+            if method != "POST":
+                return 405, {"error": "Use POST to reload"}
+            try:
+                await self.reload()
+            except Exception as e:    # Data lama tetap dipakai jika reload gagal
+                return 500, {"error": f"Reload failed: {e}"}
+            return 200, self.health()
+        if path == "/recommend":
+            if method != "GET":
+                return 405, {"error": "Use GET for recommendations"}
+            return await self._recommend(parse_qs(scope.get("query_string", b"").decode()))
+        return 404, {"error": "Not found"}
+
+    async def _recommend(self, params):
+        recommender = self.recommender    # Ambil satu referensi agar tidak berubah di tengah request
+        if recommender is None:
+            return 503, {"error": "Dataset is still loading"}
+
+        area = params.get("area", [None])[0]
+        property_type = params.get("type", [None])[0]
+        if area is None or property_type is None:
+            return 400, {"error": "Query parameters 'area' and 'type' are required"}
+        mode = params.get("mode", ["first"])[0]
+        if mode not in RECOMMENDATION_MODES:
+            return 400, {"error": f"Unknown mode {mode!r}; expected one of {list(RECOMMENDATION_MODES)}"}
+        try:
+            top_n = int(params.get("top_n", ["4"])[0])
+        except ValueError:
+            return 400, {"error": "top_n must be an integer"}
+        if top_n <= 0:    # Bukan "tidak ada hasil" (404), melainkan parameter yang tidak valid
+            return 400, {"error": "top_n must be a positive integer"}
+        exclude_group = params.get("exclude_group", ["0"])[0].lower() in ("1", "true", "yes")
+
+        # Skoring CPU-bound dijalankan di thread agar event loop tetap melayani request lain (termasuk /healthz)
+        recommended = await asyncio.to_thread(recommender.recommend, area, property_type, top_n, mode, exclude_group)
+        if recommended.empty:
+            return 404, {"error": "No properties found for this selection"}
+        return 200, {"results": json.loads(recommended.to_json(orient="records", force_ascii=False))}
+
+
+async def send_json(send, status, body):
+    # Kirim respons JSON lengkap dalam satu body
+    payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(payload)).encode())],
+    })
+    await send({"type": "http.response.body", "body": payload})
+
+
+def serve(data_path=None, features_path=None, host="127.0.0.1", port=8000, source=None, cache_dir=None, refresh_interval=None):
+    # Jalankan layanan dengan uvicorn (dependensi opsional, hanya dibutuhkan untuk mode serve)
+    try:
+        import uvicorn
+    except ImportError as e:
+        raise RuntimeError("The HTTP service needs uvicorn: pip install uvicorn") from e
+    service = RecommenderService(data_path, features_path, source, cache_dir, refresh_interval=refresh_interval)
+    uvicorn.run(service, host=host, port=port, log_level="info")
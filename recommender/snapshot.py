@@ -0,0 +1,119 @@
+"""Snapshot recommender yang sudah diproses, disimpan di disk untuk warm start.
+
+Snapshot berisi semua hasil pemrosesan satu file data: tabel properti,
+matriks fitur yang sudah di-decode, norma L2 indeks kemiripan, partition
+index dan catatan baris rusak. Folder snapshot diberi nama dari nama file
+data dan hash isinya, sehingga proses baru (replika lain, restart) yang
+membaca file yang sama langsung memuat snapshot tanpa decode vektor,
+tanpa membaca Excel dan tanpa menghitung ulang indeks. Array disimpan
+sebagai ``.npy`` dan dibuka dengan mmap.
+
+Karena ``state.pkl`` di-unpickle, snapshot hanya dibaca jika file itu milik
+user yang sedang berjalan dan tidak bisa ditulis user lain; folder cache
+default (``default_cache_dir``) dibuat per user dengan mode 0700.
+"""
+import hashlib      # Mengimpor hashlib untuk hash isi file data
+import json     # Mengimpor json untuk manifest snapshot
+import os       # Mengimpor os
+import pickle       # Mengimpor pickle untuk tabel properti dan partition index
+import shutil       # Mengimpor shutil untuk mengganti snapshot secara atomik
+import time     # Mengimpor time untuk waktu pembuatan snapshot
+import warnings     # Mengimpor warnings untuk snapshot yang diabaikan
+import numpy as np      # Mengimpor numpy untuk menyimpan array
+from scipy import sparse      # Mengimpor scipy.sparse untuk matriks fitur sparse (CSR)
+
+SNAPSHOT_VERSION = 2    # Naikkan jika isi snapshot berubah agar snapshot lama diabaikan
+SNAPSHOT_MANIFEST = "manifest.json"    # Ditulis terakhir; folder tanpa manifest dianggap tidak lengkap
+
+# Fungsi untuk membuat folder yang hanya bisa diakses user saat ini (mode 0700)
+def private_dir(path):
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    if not is_private(os.stat(path)):
+        raise PermissionError(f"{path} must be owned by the current user and not writable by others.")
+    return path
+
+# Fungsi untuk mengecek file/folder milik user saat ini dan tidak bisa ditulis group/user lain
+def is_private(stat):
+    owned = not hasattr(os, "getuid") or stat.st_uid == os.getuid()    # Tanpa getuid (Windows) hanya mode yang dicek
+    return owned and not stat.st_mode & 0o022
+
+# Fungsi untuk folder cache default per user: $XDG_CACHE_HOME/bukit_vista atau ~/.cache/bukit_vista
+def default_cache_dir():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return private_dir(os.path.join(base, "bukit_vista"))
+
+# Fungsi untuk menentukan folder snapshot dari nama file data, isinya, dan versi file fitur pendamping
+def snapshot_dir(cache_dir, file_name, content, features_path=None):
+    digest = hashlib.sha256(content)
+    if features_path is not None:    # Matriks fitur yang berubah (ditimpa / di-download ulang) menghasilkan snapshot lain
+        for path in features_path if isinstance(features_path, (list, tuple)) else [features_path]:
+            stat = os.stat(path)
+            digest.update(f"\0{os.path.abspath(path)}\0{stat.st_size}\0{stat.st_mtime_ns}".encode())
+    stem = os.path.splitext(os.path.basename(file_name))[0]
+    return os.path.join(cache_dir, "snapshots", f"{stem}-{digest.hexdigest()[:16]}")
+
+# Fungsi untuk menyimpan state recommender ke folder snapshot (ditulis ke folder sementara lalu diganti atomik)
+def save_snapshot(recommender, directory):
+    private_dir(os.path.dirname(directory))    # Folder snapshots hanya untuk user ini
+    tmp_dir = f"{directory}.tmp{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir, mode=0o700)
+
+    vectors = recommender.similarity_index.vectors
+    if sparse.issparse(vectors):    # Komponen CSR disimpan terpisah agar tetap bisa di-mmap
+        for part in ("data", "indices", "indptr"):
+            np.save(os.path.join(tmp_dir, f"vectors_{part}.npy"), getattr(vectors, part))
+    else:
+        np.save(os.path.join(tmp_dir, "vectors.npy"), vectors)
+    np.save(os.path.join(tmp_dir, "inv_norms.npy"), recommender.similarity_index.inv_norms)
+    with open(os.path.join(tmp_dir, "state.pkl"), "wb") as f:
+        pickle.dump({
+            "df": recommender.df,
+            "partition_index": recommender.partition_index,
+            "malformed_rows": recommender.malformed_rows,
+        }, f, protocol=pickle.HIGHEST_PROTOCOL)
+    with open(os.path.join(tmp_dir, SNAPSHOT_MANIFEST), "w") as f:
+        json.dump({
+            "snapshot_version": SNAPSHOT_VERSION,
+            "name": recommender.name,
+            "rows": len(recommender.df),
+            "shape": list(vectors.shape),
+            "sparse": sparse.issparse(vectors),
+            "created_at": time.time(),
+        }, f)
+
+    if os.path.exists(directory):    # Proses lain sudah menulis snapshot yang sama
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return directory
+    try:
+        os.replace(tmp_dir, directory)
+    except OSError:    # Kalah balapan dengan proses lain yang menulis snapshot yang sama
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return directory
+
+# Fungsi untuk memuat state dari folder snapshot; None jika snapshot tidak ada, tidak lengkap, versinya lain,
+# atau tidak aman di-unpickle (bukan milik user ini / bisa ditulis user lain)
+def load_snapshot(directory):
+    manifest_path = os.path.join(directory, SNAPSHOT_MANIFEST)
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    if manifest.get("snapshot_version") != SNAPSHOT_VERSION:
+        return None
+
+    if manifest["sparse"]:
+        parts = [np.load(os.path.join(directory, f"vectors_{part}.npy"), mmap_mode="r") for part in ("data", "indices", "indptr")]
+        vectors = sparse.csr_matrix(tuple(parts), shape=tuple(manifest["shape"]))
+    else:
+        vectors = np.load(os.path.join(directory, "vectors.npy"), mmap_mode="r")    # Dibaca zero-copy lewat mmap
+    with open(os.path.join(directory, "state.pkl"), "rb") as f:
+        # Cek pemilik file yang benar-benar dibuka (fstat), bukan path, agar tidak bisa ditukar setelah dicek
+        if not is_private(os.fstat(f.fileno())) or not is_private(os.stat(directory)):
+            warnings.warn(f"Ignoring recommender snapshot {directory}: not owned by the current user or writable by others.")
+            return None
+        state = pickle.load(f)
+    state["name"] = manifest["name"]
+    state["vectors"] = vectors
+    state["inv_norms"] = np.load(os.path.join(directory, "inv_norms.npy"), mmap_mode="r")
+    return state
@@ -0,0 +1,264 @@
+"""Sumber data artefak: folder lokal, tiruan Google Drive API (lokal), dan Google Drive asli.
+
+Semua backend memakai aturan pemilihan file terbaru yang sama: nama
+``data_bukit_vista_<dd-mm-yyyy>.(parquet|xlsx)`` dengan tanggal terbaru,
+dan Parquet diutamakan jika ada dua file pada tanggal yang sama.
+
+Spesifikasi sumber berbentuk ``<jenis>:<lokasi>``:
+    local:/path/to/folder        folder lokal
+    fakedrive:/root/<folder_id>  tiruan Drive API; subfolder di /root = ID folder Drive
+    drive:<folder_id>            Google Drive asli (membutuhkan service Drive v3)
+"""
+import datetime     # Mengimpor datetime untuk parsing tanggal dari nama file
+import hashlib      # Mengimpor hashlib untuk nama file cache per versi
+import os       # Mengimpor os
+import re       # Mengimpor re
+import tempfile     # Mengimpor tempfile untuk file sementara yang unik per proses
+
+from .artifact import DATA_FILE_PATTERN, feature_file_names
+
+DRIVE_MIME_TYPES = {    # MIME type yang dilaporkan tiruan Drive berdasarkan ekstensi
+    ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ".parquet": "application/vnd.apache.parquet",
+    ".npy": "application/octet-stream",
+    ".npz": "application/zip",
+}
+
+# Fungsi untuk urutan upload file: file dengan nama sama (upload ulang di hari yang sama) dibedakan dari waktu upload
+def file_recency(file):
+    return file.get("createdTime") or "", file.get("modifiedTime") or ""
+
+# Fungsi untuk memilih file data terbaru dari daftar file ({"id", "name", ...})
+def select_latest_data_file(files):
+    latest_file = None
+    latest_key = None
+
+    for file in files:    # Loop tiap file
+        match = DATA_FILE_PATTERN.match(file["name"])    # Cek apakah nama file sesuai pola
+        if match:
+            file_date = datetime.datetime.strptime(match.group(1), "%d-%m-%Y")    # Parsing tanggal dari nama file
+            # Pada tanggal yang sama, Parquet lebih diutamakan; nama yang sama: upload terbaru
+            file_key = (file_date, match.group(2) == "parquet", file_recency(file))
+            if latest_key is None or file_key > latest_key:    # Cari tanggal terbaru
+                latest_key = file_key
+                latest_file = file    # Simpan file terbaru
+    return latest_file
+
+
+class DataSource:
+    """Antarmuka sumber data: daftar file, baca isi file, dan salin file ke disk lokal."""
+
+    def list_files(self):
+        # Daftar file di sumber: list of {"id", "name", "modifiedTime"} (Drive juga "createdTime")
+        raise NotImplementedError
+
+    def read_bytes(self, file_id):
+        # Isi file dalam bentuk bytes
+        raise NotImplementedError
+
+    def find_file_info(self, name):
+        # Metadata file terbaru dengan nama tertentu ({"id", "name", "modifiedTime", ...}), None jika tidak ada
+        matches = [file for file in self.list_files() if file["name"] == name]
+        return max(matches, key=file_recency) if matches else None
+
+    def find_file(self, name):
+        # ID file terbaru dengan nama tertentu, None jika tidak ada
+        file = self.find_file_info(name)
+        return file["id"] if file else None
+
+    def latest_data_file(self):
+        # File data terbaru ({"id", "name", ...}) atau None
+        return select_latest_data_file(self.list_files())
+
+    def local_path(self, file, cache_dir):
+        # Path lokal untuk file {"id", "name", "modifiedTime"}: di-download ke cache_dir sekali per versi.
+        # Nama cache memuat hash ID + modifiedTime, sehingga file yang ditimpa atau di-upload ulang
+        # dengan nama sama tidak memakai salinan lama.
+        version = hashlib.sha256(f"{file['id']}\0{file.get('modifiedTime')}".encode()).hexdigest()[:16]
+        stem, extension = os.path.splitext(file["name"])
+        local_path = os.path.join(cache_dir, f"{stem}-{version}{extension}")
+        if os.path.exists(local_path):    # Pakai ulang file yang sudah ada di disk
+            return local_path
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=f"{stem}-", suffix=".tmp")    # Unik per proses
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(self.read_bytes(file["id"]))
+            os.replace(tmp_path, local_path)    # Diganti secara atomik
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        return local_path
+
+
+class LocalDirectorySource(DataSource):
+    """Artefak dibaca langsung dari folder lokal (tanpa jaringan, tanpa salinan)."""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def list_files(self):
+        files = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    modified = datetime.datetime.fromtimestamp(entry.stat().st_mtime, datetime.timezone.utc)
+                    files.append({"id": entry.path, "name": entry.name, "modifiedTime": modified.isoformat()})
+        return files
+
+    def read_bytes(self, file_id):
+        with open(file_id, "rb") as f:
+            return f.read()
+
+    def local_path(self, file, cache_dir):
+        return file["id"]    # File sudah ada di disk, bisa langsung di-mmap
+
+
+class DriveSource(DataSource):
+    """Artefak dari satu folder Google Drive melalui service Drive API v3."""
+
+    def __init__(self, service, folder_id):
+        self.service = service
+        self.folder_id = folder_id
+
+    @classmethod
+    def from_service_account_info(cls, credentials_info, folder_id):
+        from google.oauth2 import service_account    # Diimpor saat dibutuhkan agar backend lokal tidak memerlukan Google API
+        from googleapiclient.discovery import build
+        creds = service_account.Credentials.from_service_account_info(credentials_info)    # Membuat objek kredensial
+        return cls(build("drive", "v3", credentials=creds), folder_id)
+
+    def list_files(self):
+        files = []
+        page_token = None
+        while True:    # Ikuti semua halaman hasil agar file terbaru tidak terlewat
+            results = self.service.files().list(    # Ambil file artefak dalam folder (hanya metadata)
+                q=f"'{self.folder_id}' in parents and trashed=false",
+                fields="nextPageToken, files(id, name, createdTime, modifiedTime)",
+                orderBy="createdTime desc",    # Urutkan dari file terbaru
+                pageSize=1000,
+                pageToken=page_token,
+            ).execute()
+            files.extend(results.get("files", []))
+            page_token = results.get("nextPageToken")
+            if not page_token:
+                return files
+
+    def find_file_info(self, name):
+        results = self.service.files().list(    # Cari file berdasarkan nama di folder yang sama
+            q=f"'{self.folder_id}' in parents and name='{name}' and trashed=false",
+            fields="files(id, name, createdTime, modifiedTime)",
+            orderBy="createdTime desc",    # Upload ulang dengan nama sama: ambil yang terbaru
+        ).execute()
+        files = results.get("files", [])
+        return max(files, key=file_recency) if files else None
+
+    def read_bytes(self, file_id):
+        return self.service.files().get_media(fileId=file_id).execute()    # Download isi file
+
+
+class FakeDriveService:
+    """Tiruan lokal sebagian kecil Google Drive API v3 (files().list / files().get_media).
+
+    Setiap subfolder di ``root`` berperan sebagai folder Drive dengan ID sama
+    dengan nama subfolder, dan ID file adalah ``<folder_id>/<nama file>``.
+    Query ``q`` yang didukung: ``'<id>' in parents``, ``name='<nama>'``,
+    ``name contains '<teks>'``, ``mimeType='<tipe>'`` dan ``trashed=false``.
+    Hasil dibagi per halaman seperti Drive: paling banyak ``pageSize`` file
+    (dibatasi ``max_page_size``) dan ``nextPageToken`` selama masih ada sisa.
+    """
+
+    def __init__(self, root, max_page_size=1000):
+        self.root = root
+        self.max_page_size = max_page_size    # Batas ukuran halaman dari sisi server, seperti Drive
+        self.calls = []    # Catatan pemanggilan API, berguna untuk pengujian
+
+    def files(self):
+        return self
+
+    def list(self, q="", fields=None, orderBy=None, pageSize=100, pageToken=None, **kwargs):
+        self.calls.append(("list", q))
+        parents = re.findall(r"'([^']*)' in parents", q)
+        names = re.findall(r"name\s*=\s*'([^']*)'", q)
+        contains = re.findall(r"name contains '([^']*)'", q)
+        mime_types = re.findall(r"mimeType\s*=\s*'([^']*)'", q)
+
+        files = []
+        for folder_id in parents or os.listdir(self.root):
+            folder = os.path.join(self.root, folder_id)
+            if not os.path.isdir(folder):
+                continue
+            for name in os.listdir(folder):
+                path = os.path.join(folder, name)
+                mime_type = DRIVE_MIME_TYPES.get(os.path.splitext(name)[1], "application/octet-stream")
+                if names and name not in names:
+                    continue
+                if any(text not in name for text in contains):
+                    continue
+                if mime_types and mime_type not in mime_types:
+                    continue
+                stat = os.stat(path)
+                files.append({
+                    "id": f"{folder_id}/{name}",
+                    "name": name,
+                    "mimeType": mime_type,
+                    "createdTime": datetime.datetime.fromtimestamp(stat.st_ctime, datetime.timezone.utc).isoformat(),
+                    "modifiedTime": datetime.datetime.fromtimestamp(stat.st_mtime, datetime.timezone.utc).isoformat(),
+                })
+        if orderBy == "createdTime desc":
+            files.sort(key=lambda file: (file["createdTime"], file["id"]), reverse=True)
+        else:
+            files.sort(key=lambda file: file["id"])    # Urutan tetap agar token halaman konsisten
+
+        start = int(pageToken or 0)    # Token halaman = posisi file pertama halaman berikutnya
+        end = start + min(pageSize, self.max_page_size)
+        result = {"files": files[start:end]}
+        if end < len(files):
+            result["nextPageToken"] = str(end)
+        return FakeDriveRequest(result)
+
+    def get_media(self, fileId):
+        self.calls.append(("get_media", fileId))
+        with open(os.path.join(self.root, fileId), "rb") as f:
+            return FakeDriveRequest(f.read())
+
+
+class FakeDriveRequest:
+    """Hasil request tiruan Drive; ``execute()`` mengembalikan hasil yang sudah disiapkan."""
+
+    def __init__(self, result):
+        self.result = result
+
+    def execute(self):
+        return self.result
+
+
+# Fungsi untuk membuat DataSource dari spesifikasi "<jenis>:<lokasi>"
+def open_source(spec, drive_service=None):
+    kind, _, location = spec.partition(":")
+    if kind == "local":
+        return LocalDirectorySource(location)
+    if kind == "fakedrive":
+        location = location.rstrip("/")
+        root, folder_id = os.path.dirname(location), os.path.basename(location)    # Folder terakhir = ID folder Drive
+        return DriveSource(FakeDriveService(root), folder_id)
+    if kind == "drive":
+        if drive_service is None:
+            raise ValueError("A Google Drive service is required for drive: sources.")
+        return DriveSource(drive_service, location)
+    raise ValueError(f"Unknown data source {spec!r}; expected local:, fakedrive: or drive:")
+
+# Fungsi untuk mendapatkan path lokal matriks fitur pendamping sebuah file data
+# (satu path, daftar path komponen CSR untuk artefak versi 2, atau None)
+def fetch_feature_file(source, file_name, cache_dir, manifest=None):
+    paths = []
+    for features_name in feature_file_names(file_name, manifest):    # Nama file fitur pada tanggal yang sama
+        features_file = source.find_file_info(features_name)
+        if features_file is None:
+            if file_name.endswith(".parquet"):    # Artefak Parquet wajib punya matriks fitur
+                raise ValueError(f"{features_name} not found next to {file_name}.")
+            return None    # File Excel lama belum punya matriks fitur terpisah
+        paths.append(source.local_path(features_file, cache_dir))
+    if not paths:
+        return None
+    return paths if len(paths) > 1 else paths[0]
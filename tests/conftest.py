@@ -0,0 +1,77 @@
+"""Fixture bersama untuk test paket ``recommender``: katalog kecil dengan baris fitur yang identik."""
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from scipy import sparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from recommender.artifact import ARTIFACT_METADATA_KEY, FEATURE_PARTS    # noqa: E402
+
+AREAS = ["Uluwatu", "Canggu", "Yogyakarta"]
+PROPERTY_TYPES = ["Villa", "Guest House"]
+TAGS = ["pool", "beach", "surf", "rice field"]
+
+
+def make_catalog(n_rows=60, seed=7, duplicates=True):
+    # Fitur one-hot area/tipe/tag seperti vektor TF-IDF scraper: listing dengan area, tipe dan tag sama
+    # menghasilkan baris fitur yang persis sama. duplicates=False menambahkan kolom acak agar semua baris unik.
+    rng = np.random.default_rng(seed)
+    area = rng.choice(AREAS, n_rows)
+    property_type = rng.choice(PROPERTY_TYPES, n_rows)
+    tags = rng.choice(TAGS, n_rows)
+    df = pd.DataFrame({
+        "title": [f"Listing {i}" for i in range(n_rows)],
+        "image_url": [f"https://example.com/{i}.jpg" for i in range(n_rows)],
+        "price_info": [f"Starting from ${50 + i}.0 per night" for i in range(n_rows)],
+        "area": area,
+        "property_type": property_type,
+    })
+    blocks = [(area[:, None] == np.array(AREAS)) * 1.0,
+              (property_type[:, None] == np.array(PROPERTY_TYPES)) * 0.8,
+              (tags[:, None] == np.array(TAGS)) * 0.6]
+    if not duplicates:
+        blocks.append(rng.random((n_rows, 5)))
+    features = np.hstack(blocks).astype(np.float32)
+    return df, features
+
+
+@pytest.fixture
+def duplicate_catalog():
+    return make_catalog(duplicates=True)
+
+
+@pytest.fixture
+def unique_catalog():
+    return make_catalog(duplicates=False)
+
+
+def write_artifact(directory, date, df, features):
+    # Artefak versi 2 seperti save_artifact di scraper: Parquet + manifest dan komponen CSR .npy terpisah
+    os.makedirs(directory, exist_ok=True)
+    features = sparse.csr_matrix(features, dtype=np.float32)
+    features_files = {part: f"features_bukit_vista_{date}.{part}.npy" for part in FEATURE_PARTS}
+    for part, name in features_files.items():
+        np.save(os.path.join(directory, name), getattr(features, part))
+    manifest = {"artifact_version": 2, "features_files": features_files,
+                "features_shape": [int(n) for n in features.shape], "dtype": "float32"}
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[ARTIFACT_METADATA_KEY] = json.dumps(manifest).encode()
+    data_path = os.path.join(directory, f"data_bukit_vista_{date}.parquet")
+    pq.write_table(table.replace_schema_metadata(metadata), data_path)
+    return data_path
+
+
+@pytest.fixture
+def drive_root(tmp_path):
+    # Root tiruan Drive dengan satu folder "FOLDER" berisi artefak versi 2 tanggal 01-03-2024
+    df, features = make_catalog()
+    write_artifact(str(tmp_path / "drive" / "FOLDER"), "01-03-2024", df, features)
+    return str(tmp_path / "drive")
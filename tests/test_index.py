@@ -0,0 +1,65 @@
+"""SimilarityIndex dibandingkan dengan pipeline lama (cosine_similarity + np.argsort)."""
+import numpy as np
+import pytest
+from scipy import sparse
+from sklearn.metrics.pairwise import cosine_similarity
+
+from recommender import Recommender
+
+
+def old_similarity_row(df, features, area, property_type):
+    # Implementasi lama recommendation_system.py: matriks N x N float64 dan properti pertama sebagai referensi
+    similarity_matrix = cosine_similarity(features.astype(np.float64))
+    filtered_df = df[(df["area"] == area) & (df["property_type"] == property_type)]
+    reference_index = filtered_df.index[0]
+    return reference_index, similarity_matrix[reference_index]
+
+
+def old_recommend(df, features, area, property_type, top_n):
+    reference_index, row = old_similarity_row(df, features, area, property_type)
+    similar_indices = np.argsort(row)[::-1][1:top_n + 1]
+    return similar_indices, row[similar_indices]
+
+
+def queries(df):
+    return [(area, property_type) for area in df["area"].unique() for property_type in df["property_type"].unique()
+            if ((df["area"] == area) & (df["property_type"] == property_type)).any()]
+
+
+@pytest.mark.parametrize("as_sparse", [False, True], ids=["dense", "sparse"])
+def test_matches_old_pipeline_without_ties(unique_catalog, as_sparse):
+    df, features = unique_catalog
+    recommender = Recommender(df, sparse.csr_matrix(features) if as_sparse else features)
+    for area, property_type in queries(df):
+        expected_indices, expected_scores = old_recommend(df, features, area, property_type, top_n=6)
+        result = recommender.recommend(area, property_type, top_n=6)
+        assert list(result.index) == list(expected_indices)
+        np.testing.assert_allclose(result["similarity_score"], expected_scores, rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize("as_sparse", [False, True], ids=["dense", "sparse"])
+def test_duplicate_rows_follow_tie_rule(duplicate_catalog, as_sparse):
+    df, features = duplicate_catalog
+    recommender = Recommender(df, sparse.csr_matrix(features) if as_sparse else features)
+    for area, property_type in queries(df):
+        reference_index, row = old_similarity_row(df, features, area, property_type)
+        # Pipeline lama mengurutkan skor sama dengan quicksort (tidak stabil), jadi yang dibandingkan adalah skornya
+        _, expected_scores = old_recommend(df, features, area, property_type, top_n=8)
+        result = recommender.recommend(area, property_type, top_n=8)
+        indices, scores = np.asarray(result.index), result["similarity_score"].to_numpy()
+
+        np.testing.assert_allclose(scores, expected_scores, rtol=0, atol=1e-12)
+        np.testing.assert_allclose(scores, row[indices], rtol=0, atol=1e-12)
+        assert reference_index not in indices    # Properti referensi sendiri tidak pernah direkomendasikan
+        # Aturan tie: skor tertinggi dulu, skor sama -> posisi baris terkecil dulu
+        assert list(indices) == sorted(indices, key=lambda i: (-scores[list(indices).index(i)], i))
+
+
+def test_identical_rows_get_identical_scores(duplicate_catalog):
+    df, features = duplicate_catalog
+    recommender = Recommender(df, features)
+    first = df.index[0]
+    twins = [i for i in df.index if np.array_equal(features[i], features[first])]
+    assert len(twins) > 1
+    scores = recommender.similarity_index.scores(first)
+    assert len(set(scores[twins])) == 1    # Persis sama, bukan 1.0000001 vs 0.99999994
@@ -0,0 +1,37 @@
+"""Mode rekomendasi multi-referensi (centroid, max)."""
+import numpy as np
+import pandas as pd
+from sklearn.metrics.pairwise import cosine_similarity
+
+from recommender import Recommender
+
+
+def test_max_mode_recommends_non_group_listings_by_best_match(duplicate_catalog):
+    df, features = duplicate_catalog
+    recommender = Recommender(df, features)
+    similarity_matrix = cosine_similarity(features.astype(np.float64))
+    for area, property_type in recommender.partition_index.groups:
+        group = recommender.partition_index.rows(area, property_type)
+        result = recommender.recommend(area, property_type, top_n=5, mode="max")
+
+        best = similarity_matrix[:, group].max(axis=1)    # Kemiripan terbaik terhadap salah satu anggota kelompok
+        candidates = [i for i in range(len(df)) if i not in set(group)]
+        expected = sorted(candidates, key=lambda i: (-round(best[i], 12), i))[:5]
+        assert not set(result.index) & set(group)    # Bukan listing kelompok itu sendiri
+        assert list(result.index) == expected
+        np.testing.assert_allclose(result["similarity_score"], best[expected], rtol=0, atol=1e-12)
+
+
+def test_max_mode_with_two_listing_group():
+    # Dua listing di kelompok (Uluwatu, Villa): dulu keduanya kembali sebagai hasil teratas dengan skor 1.0
+    df = pd.DataFrame({
+        "title": ["Group A", "Group B", "Near A", "Near B", "Far"],
+        "image_url": ["https://example.com/x.jpg"] * 5,
+        "price_info": ["Starting from $50.0 per night"] * 5,
+        "area": ["Uluwatu", "Uluwatu", "Canggu", "Canggu", "Canggu"],
+        "property_type": ["Villa", "Villa", "Villa", "Guest House", "Guest House"],
+    })
+    features = np.array([[1, 0, 0], [0, 1, 0], [1, 0.2, 0], [0.1, 1, 0.3], [0, 0, 1]], dtype=np.float32)
+    result = Recommender(df, features).recommend("Uluwatu", "Villa", top_n=2, mode="max")
+    assert list(result["title"]) == ["Near A", "Near B"]
+    assert (result["similarity_score"] < 1.0).all()
@@ -0,0 +1,71 @@
+"""Refresher dengan tiruan Drive: swap saat modifiedTime berubah, error reload, dan pembersihan cache lama."""
+import os
+
+from recommender import Refresher, open_source
+from recommender.snapshot import private_dir
+from conftest import make_catalog, write_artifact
+
+
+def cache_entries(cache_dir):
+    files = sorted(name for name in os.listdir(cache_dir) if name != "snapshots")
+    return files + sorted(os.path.join("snapshots", name) for name in os.listdir(os.path.join(cache_dir, "snapshots")))
+
+
+def upload(folder, prefix, modified):
+    # Timpa artefak dengan nama sama dan modifiedTime baru, seperti upload ulang ke Drive
+    df, features = make_catalog()
+    df["title"] = [f"{prefix} {i}" for i in range(len(df))]
+    write_artifact(folder, "01-03-2024", df, features)
+    for name in os.listdir(folder):
+        os.utime(os.path.join(folder, name), (modified, modified))
+
+
+def test_refresh_swaps_keeps_serving_and_prunes_cache(drive_root, tmp_path):
+    folder = os.path.join(drive_root, "FOLDER")
+    upload(folder, "First", 1_700_000_000)
+    cache_dir = private_dir(str(tmp_path / "cache"))
+    refresher = Refresher(open_source(f"fakedrive:{folder}"), cache_dir, interval=0)
+
+    assert refresher.refresh()
+    first = refresher.current
+    first_entries = cache_entries(cache_dir)
+    assert len(first_entries) == 4    # 3 komponen CSR + 1 snapshot
+    assert not refresher.refresh()    # modifiedTime sama: tidak ditukar
+
+    # File baru: dataset ditukar, cache versi lama dihapus
+    upload(folder, "Second", 1_700_000_100)
+    assert refresher.refresh()
+    second = refresher.current
+    assert second is not first
+    assert second.recommender.df["title"].iloc[0] == "Second 0"
+    second_entries = cache_entries(cache_dir)
+    assert len(second_entries) == 4
+    assert not set(first_entries) & set(second_entries)
+
+    # Reload gagal (Parquet rusak): error dicatat, dataset lama tetap melayani request, cache-nya tidak dihapus
+    with open(os.path.join(folder, "data_bukit_vista_01-03-2024.parquet"), "wb") as f:
+        f.write(b"not a parquet file")
+    os.utime(os.path.join(folder, "data_bukit_vista_01-03-2024.parquet"), (1_700_000_200, 1_700_000_200))
+    assert not refresher.poll()
+    assert refresher.last_error and refresher.status()["last_error"] == refresher.last_error
+    assert refresher.current is second
+    assert list(second.recommender.recommend("Uluwatu", "Villa", top_n=2)["title"].str.startswith("Second")) == [True, True]
+    assert cache_entries(cache_dir) == second_entries
+
+    # Upload berikutnya berhasil: error dihapus dan hanya cache versi terbaru yang tersisa
+    upload(folder, "Third", 1_700_000_300)
+    assert refresher.poll()
+    assert refresher.last_error is None
+    assert refresher.current.recommender.df["title"].iloc[0] == "Third 0"
+    assert len(cache_entries(cache_dir)) == 4
+    assert not set(cache_entries(cache_dir)) & set(second_entries)
+
+
+def test_local_source_files_are_never_removed(tmp_path):
+    folder = str(tmp_path / "data")
+    upload(folder, "First", 1_700_000_000)
+    refresher = Refresher(open_source(f"local:{folder}"), private_dir(str(tmp_path / "cache")), interval=0)
+    refresher.refresh()
+    upload(folder, "Second", 1_700_000_100)
+    assert refresher.refresh()
+    assert len(os.listdir(folder)) == 4    # File fitur dibaca langsung dari folder sumber, bukan salinan cache
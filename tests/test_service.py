@@ -0,0 +1,85 @@
+"""Layanan ASGI dijalankan langsung dengan scope/receive/send: validasi parameter, 404 dan /reload."""
+import asyncio
+import json
+import os
+import threading
+
+import pytest
+
+from recommender import Recommender, RecommenderService
+from conftest import make_catalog, write_artifact
+
+
+def call(service, path, query="", method="GET"):
+    # Satu request HTTP ke aplikasi ASGI; mengembalikan (status, body JSON)
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": method, "path": path, "query_string": query.encode()}
+    asyncio.run(service(scope, receive, send))
+    return messages[0]["status"], json.loads(messages[1]["body"])
+
+
+@pytest.fixture
+def service(tmp_path):
+    df, features = make_catalog()
+    data_path = write_artifact(str(tmp_path / "data"), "01-03-2024", df, features)
+    service = RecommenderService(data_path)
+    service.load()
+    return service
+
+
+def test_recommend(service):
+    status, body = call(service, "/recommend", "area=Uluwatu&type=Villa&top_n=3")
+    assert status == 200
+    expected = service.recommender.recommend("Uluwatu", "Villa", 3)
+    assert [row["title"] for row in body["results"]] == list(expected["title"])
+
+
+@pytest.mark.parametrize("query", ["area=Uluwatu&type=Villa&top_n=0", "area=Uluwatu&type=Villa&top_n=-2",
+                                   "area=Uluwatu&type=Villa&top_n=abc", "area=Uluwatu", "area=Uluwatu&type=Villa&mode=best"])
+def test_invalid_parameters_are_400(service, query):
+    status, body = call(service, "/recommend", query)
+    assert status == 400
+    assert "error" in body
+
+
+def test_unknown_selection_is_404(service):
+    status, body = call(service, "/recommend", "area=Ubud&type=Villa")
+    assert (status, body) == (404, {"error": "No properties found for this selection"})
+    assert call(service, "/unknown")[0] == 404
+
+
+def test_reload(service, tmp_path):
+    assert call(service, "/reload")[0] == 405    # Hanya POST
+
+    df, features = make_catalog()
+    df["title"] = [f"Reloaded {i}" for i in range(len(df))]
+    write_artifact(str(tmp_path / "data"), "01-03-2024", df, features)
+    status, body = call(service, "/reload", method="POST")
+    assert status == 200 and body["status"] == "ok"
+    assert service.recommender.df["title"].iloc[0] == "Reloaded 0"
+
+    # Reload gagal: 500, dataset lama tetap dipakai
+    os.remove(os.path.join(tmp_path / "data", "features_bukit_vista_01-03-2024.indptr.npy"))
+    status, body = call(service, "/reload", method="POST")
+    assert status == 500 and body["error"].startswith("Reload failed")
+    assert call(service, "/recommend", "area=Uluwatu&type=Villa")[0] == 200
+
+
+def test_recommend_runs_off_the_event_loop(service, monkeypatch):
+    threads = []
+    recommend = Recommender.recommend
+
+    def recording_recommend(self, *args):
+        threads.append(threading.current_thread())
+        return recommend(self, *args)
+
+    monkeypatch.setattr(Recommender, "recommend", recording_recommend)
+    assert call(service, "/recommend", "area=Uluwatu&type=Villa")[0] == 200
+    assert threads and threads[0] is not threading.main_thread()
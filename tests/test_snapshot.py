@@ -0,0 +1,102 @@
+"""Snapshot recommender: round-trip, invalidasi saat isi file berubah, dan penolakan folder cache bersama."""
+import os
+import warnings
+
+import pytest
+
+from recommender import LocalDirectorySource, Recommender, load_snapshot
+from recommender.snapshot import default_cache_dir, private_dir
+from conftest import make_catalog, write_artifact
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def snapshot_names(cache_dir):
+    return sorted(os.listdir(os.path.join(cache_dir, "snapshots")))
+
+
+@pytest.fixture
+def artifact_dir(tmp_path):
+    df, features = make_catalog()
+    write_artifact(str(tmp_path / "data"), "01-03-2024", df, features)
+    return str(tmp_path / "data")
+
+
+def test_snapshot_round_trip(artifact_dir, tmp_path):
+    cache_dir = private_dir(str(tmp_path / "cache"))
+    source = LocalDirectorySource(artifact_dir)
+    built = Recommender.from_source(source, cache_dir)
+    [name] = snapshot_names(cache_dir)
+    assert name.startswith("data_bukit_vista_01-03-2024-")
+    assert load_snapshot(os.path.join(cache_dir, "snapshots", name)) is not None
+
+    loaded = Recommender.from_source(source, cache_dir)    # Dimuat dari snapshot
+    assert loaded.name == built.name
+    for area, property_type in [("Uluwatu", "Villa"), ("Canggu", "Guest House")]:
+        for mode in ("first", "centroid", "max"):
+            expected = built.recommend(area, property_type, top_n=5, mode=mode)
+            result = loaded.recommend(area, property_type, top_n=5, mode=mode)
+            assert list(result["title"]) == list(expected["title"])
+            assert list(result["similarity_score"]) == list(expected["similarity_score"])
+
+
+def test_changed_content_gets_new_snapshot(artifact_dir, tmp_path):
+    cache_dir = private_dir(str(tmp_path / "cache"))
+    source = LocalDirectorySource(artifact_dir)
+    Recommender.from_source(source, cache_dir)
+
+    # File ditimpa dengan nama sama tapi isi lain: snapshot lama tidak boleh dipakai
+    df, features = make_catalog()
+    df["title"] = [f"Renamed {i}" for i in range(len(df))]
+    write_artifact(artifact_dir, "01-03-2024", df, features)
+    recommender = Recommender.from_source(source, cache_dir)
+    assert recommender.df["title"].iloc[0] == "Renamed 0"
+    assert len(snapshot_names(cache_dir)) == 2
+
+
+def test_shared_cache_dir_is_refused(artifact_dir, tmp_path, monkeypatch):
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    os.chmod(shared, 0o777)
+    with pytest.raises(PermissionError):
+        private_dir(str(shared))
+    cache_home = tmp_path / "xdg"
+    (cache_home / "bukit_vista").mkdir(parents=True)
+    os.chmod(cache_home / "bukit_vista", 0o777)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_home))
+    with pytest.raises(PermissionError):
+        default_cache_dir()
+
+    # Snapshot yang bisa ditulis user lain diabaikan dan dibangun ulang dari file data
+    cache_dir = private_dir(str(tmp_path / "cache"))
+    source = LocalDirectorySource(artifact_dir)
+    Recommender.from_source(source, cache_dir)
+    [name] = snapshot_names(cache_dir)
+    os.chmod(os.path.join(cache_dir, "snapshots", name, "state.pkl"), 0o666)
+    with pytest.warns(UserWarning, match="Ignoring recommender snapshot"):
+        assert load_snapshot(os.path.join(cache_dir, "snapshots", name)) is None
+    with pytest.warns(UserWarning, match="Ignoring recommender snapshot"):
+        assert len(Recommender.from_source(source, cache_dir).df) == 60
+
+
+def test_snapshots_disabled(artifact_dir, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    Recommender.from_source(LocalDirectorySource(artifact_dir), cache_dir, snapshots=False)
+    assert not os.path.exists(os.path.join(cache_dir, "snapshots"))
+
+
+def test_app_starts_without_snapshots_when_cache_dir_is_shared(artifact_dir, tmp_path, monkeypatch):
+    testing = pytest.importorskip("streamlit.testing.v1")
+    cache_home = tmp_path / "xdg"
+    (cache_home / "bukit_vista").mkdir(parents=True)
+    os.chmod(cache_home / "bukit_vista", 0o777)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_home))
+    monkeypatch.setenv("BUKIT_VISTA_DATA_SOURCE", f"local:{artifact_dir}")
+    monkeypatch.setenv("BUKIT_VISTA_REFRESH_SECONDS", "0")
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        app = testing.AppTest.from_file(os.path.join(ROOT, "recommendation_system.py"), default_timeout=60).run()
+    assert not app.exception
+    assert sorted(app.selectbox[0].options) == ["Canggu", "Uluwatu", "Yogyakarta"]    # Dataset tetap dimuat
+    assert os.listdir(cache_home / "bukit_vista") == []    # Tidak ada snapshot di folder bersama
@@ -0,0 +1,87 @@
+"""Sumber data tiruan Drive: pemilihan file terbaru, paginasi, cache download dan file fitur dari manifest."""
+import os
+
+import numpy as np
+import pytest
+
+from recommender.artifact import load_feature_matrix, read_data_manifest
+from recommender.sources import DriveSource, FakeDriveService, fetch_feature_file, select_latest_data_file
+from conftest import make_catalog
+
+
+def touch(folder, name, content=b"x"):
+    os.makedirs(folder, exist_ok=True)
+    with open(os.path.join(folder, name), "wb") as f:
+        f.write(content)
+
+
+def test_select_latest_across_parquet_and_xlsx():
+    files = [{"id": name, "name": name} for name in [
+        "data_bukit_vista_28-02-2024.parquet", "data_bukit_vista_05-03-2024.xlsx", "data_bukit_vista_01-03-2024.parquet",
+        "data_bukit_vista_05-03-2024.parquet", "data_bukit_vista_31-12-2023.xlsx", "features_bukit_vista_09-09-2024.npy",
+    ]]
+    # Tanggal terbaru menang (bukan urutan string dd-mm-yyyy); tanggal sama: Parquet diutamakan
+    assert select_latest_data_file(files)["name"] == "data_bukit_vista_05-03-2024.parquet"
+    assert select_latest_data_file(files[:3] + files[4:])["name"] == "data_bukit_vista_05-03-2024.xlsx"
+    assert select_latest_data_file(files[5:]) is None
+
+
+def test_drive_source_follows_pagination(tmp_path):
+    folder = str(tmp_path / "FOLDER")
+    for day in range(1, 8):
+        touch(folder, f"data_bukit_vista_{day:02d}-01-2024.xlsx")
+    touch(folder, "data_bukit_vista_15-01-2024.parquet")
+    service = FakeDriveService(str(tmp_path), max_page_size=3)
+    source = DriveSource(service, "FOLDER")
+
+    assert len(source.list_files()) == 8
+    assert len([call for call in service.calls if call[0] == "list"]) == 3    # 3 + 3 + 2 file
+    assert source.latest_data_file()["name"] == "data_bukit_vista_15-01-2024.parquet"
+
+
+def test_local_path_downloads_once_per_version(tmp_path):
+    folder = str(tmp_path / "drive" / "FOLDER")
+    touch(folder, "data_bukit_vista_01-03-2024.xlsx", b"v1")
+    service = FakeDriveService(str(tmp_path / "drive"))
+    source = DriveSource(service, "FOLDER")
+    cache_dir = str(tmp_path / "cache")
+
+    file = source.latest_data_file()
+    path = source.local_path(file, cache_dir)
+    assert open(path, "rb").read() == b"v1"
+    assert source.local_path(file, cache_dir) == path    # Dipakai ulang dari cache
+    assert [call for call in service.calls if call[0] == "get_media"] == [("get_media", file["id"])]
+
+    # File ditimpa dengan nama sama: modifiedTime berubah, jadi di-download ulang ke path baru
+    touch(folder, "data_bukit_vista_01-03-2024.xlsx", b"v2")
+    os.utime(os.path.join(folder, "data_bukit_vista_01-03-2024.xlsx"), (2_000_000_000, 2_000_000_000))
+    new_path = source.local_path(source.latest_data_file(), cache_dir)
+    assert new_path != path
+    assert open(new_path, "rb").read() == b"v2"
+    assert not [name for name in os.listdir(cache_dir) if name.endswith(".tmp")]
+
+
+def test_fetch_feature_file_uses_manifest(drive_root, tmp_path):
+    source = DriveSource(FakeDriveService(drive_root), "FOLDER")
+    cache_dir = str(tmp_path / "cache")
+    file = source.latest_data_file()
+    manifest = read_data_manifest(source.read_bytes(file["id"]), file["name"])
+
+    paths = fetch_feature_file(source, file["name"], cache_dir, manifest)
+    # Urutan komponen CSR mengikuti manifest; nama cache = <nama file>-<versi>.npy
+    for path, part in zip(paths, ["data", "indices", "indptr"]):
+        assert os.path.basename(path).startswith(f"features_bukit_vista_01-03-2024.{part}-")
+    assert all(os.path.dirname(path) == cache_dir for path in paths)
+
+    _, features = make_catalog()
+    matrix = load_feature_matrix(paths, manifest["features_shape"])
+    np.testing.assert_array_equal(matrix.toarray(), features)
+
+
+def test_fetch_feature_file_missing_part(drive_root, tmp_path):
+    source = DriveSource(FakeDriveService(drive_root), "FOLDER")
+    os.remove(os.path.join(drive_root, "FOLDER", "features_bukit_vista_01-03-2024.indptr.npy"))
+    file = source.latest_data_file()
+    manifest = read_data_manifest(source.read_bytes(file["id"]), file["name"])
+    with pytest.raises(ValueError, match="indptr"):
+        fetch_feature_file(source, file["name"], str(tmp_path / "cache"), manifest)
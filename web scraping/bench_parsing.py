@@ -0,0 +1,81 @@
+"""Micro-benchmark parser HTML untuk extractor halaman detail properti.
+
+Membandingkan waktu parse + extract per halaman antara cara lama
+(``html.parser``, seluruh dokumen) dan backend yang lebih cepat (lxml,
+parse penuh maupun parse sebagian dengan ``SoupStrainer``), sekaligus
+memastikan record yang dihasilkan sama. Halaman fixture dibaca dari file
+HTML yang disimpan atau dari cache respons HTTP hasil scraping:
+    python bench_parsing.py tests/fixtures/*.html
+    python bench_parsing.py --cache http_cache.sqlite
+"""
+import argparse     # Mengimpor argparse untuk membaca argumen CLI
+import sqlite3      # Mengimpor sqlite3 untuk membaca halaman dari cache respons
+import sys      # Mengimpor sys untuk exit code
+import time     # Mengimpor time untuk mengukur durasi
+
+from extractors import extract_property_page
+from parsing import HTML_PARSER
+
+# Variasi yang dibandingkan: nama -> argumen extract_property_page; baris pertama adalah acuan (extractor lama)
+VARIANTS = {
+    'html.parser (full)': {'parser': 'html.parser', 'scoped': False},
+    f'{HTML_PARSER} (full)': {'parser': HTML_PARSER, 'scoped': False},
+    f'{HTML_PARSER} (scoped)': {'parser': HTML_PARSER, 'scoped': True},
+}
+
+# Fungsi untuk membaca halaman properti dari file HTML
+def load_files(paths):
+    pages = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            pages.append(f.read())
+    return pages
+
+# Fungsi untuk membaca halaman detail properti dari cache respons HTTP (bukan halaman listing)
+def load_cached_pages(path, limit):
+    conn = sqlite3.connect(path)
+    rows = conn.execute("""
+        SELECT b.body FROM entries e JOIN bodies b USING (content_hash)
+        WHERE e.url LIKE '%/property/%' AND e.url NOT LIKE '%/page/%' LIMIT ?""", (limit,)).fetchall()
+    conn.close()
+    return [body for (body,) in rows]
+
+# Fungsi untuk mengukur waktu terbaik per halaman (dalam ms) dari beberapa pengulangan
+def time_variant(pages, repeat, **kwargs):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for html in pages:
+            extract_property_page(html, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best / len(pages) * 1000
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark HTML parser backends on saved property pages")
+    parser.add_argument("pages", nargs="*", help="Saved property page HTML files")
+    parser.add_argument("--cache", help="Read property pages from an HTTP cache (http_cache.sqlite) instead")
+    parser.add_argument("--limit", type=int, default=200, help="Maximum number of pages read from --cache (default: 200)")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions per variant; the best run is reported (default: 5)")
+    args = parser.parse_args(argv)
+
+    pages = load_cached_pages(args.cache, args.limit) if args.cache else load_files(args.pages)
+    if not pages:
+        parser.error("no pages to benchmark; pass HTML files or --cache")
+
+    # Record setiap variasi harus sama dengan extractor lama
+    reference = [extract_property_page(html, **VARIANTS['html.parser (full)']) for html in pages]
+    print(f"{len(pages)} halaman, {args.repeat} pengulangan")
+    baseline = None
+    all_same = True
+    for name, kwargs in VARIANTS.items():
+        same = [extract_property_page(html, **kwargs) for html in pages] == reference
+        all_same = all_same and same
+        per_page = time_variant(pages, args.repeat, **kwargs)
+        baseline = baseline or per_page
+        print(f"{name:<22} {per_page:8.2f} ms/halaman  {baseline / per_page:5.1f}x  "
+              f"{'record sama' if same else 'RECORD BERBEDA'}")
+    return 0 if all_same else 1    # Exit code 1 jika ada variasi yang hasilnya berbeda dari extractor lama
+
+
+if __name__ == "__main__":
+    sys.exit(main())
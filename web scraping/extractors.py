@@ -0,0 +1,202 @@
+"""Extractor halaman detail properti Bukit Vista.
+
+Setiap extractor menerima satu objek BeautifulSoup yang sudah di-parse,
+sehingga satu halaman cukup di-download dan di-parse sekali lalu dibaca
+oleh semua extractor (lihat ``extract_property_page``). Secara default
+hanya blok yang dibaca extractor yang di-parse (``PROPERTY_PAGE_STRAINER``).
+"""
+from bs4 import SoupStrainer
+
+from links import property_key
+from parsing import parse_html
+
+# Versi extractor; naikkan jika logika extractor berubah agar record di cache tidak dipakai ulang
+EXTRACTOR_VERSION = 3
+
+# Kolom hasil tiap extractor yang selalu ada (diisi None jika tidak ditemukan)
+COMBINED_FIELDS = ['title', 'address', 'tags']
+ADDRESS_FIELDS = ['address_detail', 'city', 'state', 'zip_code', 'area', 'country']
+
+# Pemetaan class <li> pada blok alamat ke nama kolom
+ADDRESS_CLASSES = {
+    'detail-address': 'address_detail',
+    'detail-city': 'city',
+    'detail-state': 'state',
+    'detail-zip': 'zip_code',
+    'detail-area': 'area',
+    'detail-country': 'country',
+}
+
+# Fungsi untuk standarisasi nama kolom
+def standardize_column_name(column_name):
+    # Ubah nama kolom menjadi lowercase
+    column_name = column_name.lower()
+    # Ganti bentuk jamak dengan bentuk singular (bedrooms -> bedroom, dll.)
+    replacements = {
+        'bedrooms': 'bedroom',
+        'bathrooms': 'bathroom',
+        'rooms': 'room'
+    }
+
+    # Looping melalui semua pasangan key-value dalam dictionary `replacements`
+    for key, value in replacements.items():
+        # Mengganti setiap kemunculan 'key' dalam 'column_name' dengan 'value'
+        column_name = column_name.replace(key, value)
+
+    # Hapus karakter tidak diinginkan seperti ':', spasi ekstra, atau simbol lainnya
+    column_name = ''.join(char for char in column_name if char.isalnum() or char == ' ')
+    column_name = column_name.strip().replace(' ', '_')  # Ganti spasi dengan underscore
+
+    # Mengembalikan 'column_name' yang telah diperbarui setelah semua penggantian selesai
+    return column_name
+
+# Extractor judul, alamat dan tag properti (sebelumnya scrape_property_combined)
+# container_class=None: cari langsung di soup (untuk soup hasil parse sebagian yang tidak memuat container)
+def extract_combined(soup, container_class='container'):
+    # Inisialisasi variabel untuk menyimpan data yang akan diambil
+    title = None
+    address = None
+    tags = None
+
+    # Iterasi melalui setiap container untuk mengekstrak data
+    containers = soup.find_all('div', attrs={'class': container_class}) if container_class else [soup]
+    for container in containers:
+        # Mencari elemen dengan kelas 'page-title' untuk judul properti
+        if title is None:
+            title_element = container.find(attrs={'class': 'page-title'})
+            title = title_element.text.strip() if title_element else None
+
+        # Mencari elemen dengan kelas 'item-address' untuk alamat properti
+        if address is None:
+            address_element = container.find(attrs={'class': 'item-address'})
+            address = address_element.text.strip() if address_element else None
+
+        # Mencari elemen dengan kelas 'property-labels-wrap' untuk label properti
+        if tags is None:
+            tags_element = container.find(attrs={'class': 'property-labels-wrap'})
+            tags = tags_element.text.strip() if tags_element else None
+
+    return {'title': title, 'address': address, 'tags': tags}
+
+# Extractor detail properti berdasarkan elemen <strong> dan <span> (sebelumnya property_details)
+def extract_details(soup, container_class='detail-wrap'):
+    # Dictionary untuk menyimpan data hasil scraping
+    data = {}
+
+    # Mencari container utama
+    div_container = soup.find('div', class_=container_class)
+    if div_container:
+        # Mencari semua elemen <li>
+        for field in div_container.find_all('li'):
+            # Mengambil teks dari elemen <strong> dan <span>
+            strong = field.find('strong')
+            span = field.find('span')
+            if strong and span:
+                # Standarisasi nama kolom
+                column_name = standardize_column_name(strong.text.strip())
+                data[column_name] = span.text.strip()  # Nilai berdasarkan <span>
+
+    return data
+
+# Extractor deskripsi properti yang dikelompokkan per header (sebelumnya scrape_property_descriptions)
+def extract_description(soup, container_class='block-content-wrap'):
+    # Membatasi pencarian hanya pada container 'block-content-wrap'
+    container = soup.find('div', class_=container_class)
+    if not container:
+        return None    # Container tidak ditemukan
+
+    # Memproses data menjadi dictionary yang mengelompokkan teks berdasarkan header
+    df_dict = {}
+    current_header = None
+
+    # Iterasi melalui elemen-elemen dalam container
+    for element in container.find_all(['h1', 'h2', 'h3', 'p', 'li']):
+        if element.name in ['h1', 'h2', 'h3']:
+            # Menetapkan header baru jika elemen adalah h1, h2, atau h3
+            current_header = element.text.strip().lower()
+        else:
+            # Jika tidak ada header sebelumnya, gunakan 'others' sebagai header default
+            df_dict.setdefault(current_header or "others", []).append(element.text.strip())
+
+    # Menggabungkan isi kolom menjadi satu string untuk setiap kolom (header)
+    return {key: "\n\n".join(values) for key, values in df_dict.items()}
+
+# Extractor detail alamat (sebelumnya address_details)
+def extract_address(soup, container_class='list-2-cols list-unstyled'):
+    data = dict.fromkeys(ADDRESS_FIELDS)    # Semua kolom alamat diawali None
+
+    # Mencari elemen <ul> dengan class container_class yang sesuai
+    ul_container = soup.find('ul', attrs={'class': container_class})
+    if ul_container:
+        # Mencari elemen <li> dengan kelas tertentu dan ambil teks dari <span>
+        for li in ul_container.find_all('li'):
+            span_element = li.find('span')
+            if span_element:
+                # Tentukan data berdasarkan class dari <li> untuk penandaan
+                for css_class in li.get('class', []):
+                    if css_class in ADDRESS_CLASSES:
+                        data[ADDRESS_CLASSES[css_class]] = span_element.text.strip()
+                        break
+
+    return data
+
+# Elemen yang dibaca extractor halaman detail; elemen lain dilewati saat parse
+PROPERTY_PAGE_CLASSES = {'page-title', 'item-address', 'property-labels-wrap',    # extract_combined
+                         'detail-wrap',    # extract_details
+                         'block-content-wrap',    # extract_description
+                         'list-2-cols'}    # extract_address
+
+# Cocokkan per token class: SoupStrainer(class_=[...]) membuang elemen dengan lebih dari satu class
+# (mis. <ul class="list-2-cols list-unstyled">), sehingga atribut class diperiksa sebagai string utuh
+def has_property_page_class(class_value):
+    return class_value is not None and any(css_class in PROPERTY_PAGE_CLASSES for css_class in class_value.split())
+
+PROPERTY_PAGE_STRAINER = SoupStrainer(attrs={'class': has_property_page_class})
+
+# Fungsi untuk menjalankan semua extractor pada satu halaman (satu fetch, satu parse)
+# scoped=False mem-parse seluruh dokumen seperti sebelumnya (untuk perbandingan di bench_parsing.py)
+def extract_property_page(html, parser=None, scoped=True):
+    if scoped:
+        soup = parse_html(html, parse_only=PROPERTY_PAGE_STRAINER, parser=parser)    # Parse hanya blok target
+        combined = extract_combined(soup, container_class=None)
+    else:
+        soup = parse_html(html, parser=parser)    # Parse HTML sekali
+        combined = extract_combined(soup)
+    return {
+        'combined': combined,
+        'details': extract_details(soup),
+        'description': extract_description(soup),
+        'address': extract_address(soup),
+    }
+
+# Record kosong untuk URL yang gagal di-download
+def empty_property_record():
+    return {
+        'combined': dict.fromkeys(COMBINED_FIELDS),
+        'details': {},
+        'description': None,
+        'address': dict.fromkeys(ADDRESS_FIELDS),
+    }
+
+# Class container kartu properti pada halaman listing
+LISTING_CARD_CLASS = 'd-flex align-items-center h-100'
+
+# Extractor kartu properti pada halaman listing: semua field dan gambar diambil dari satu parse
+def extract_listing_cards(html, fields, image=None, container_class=LISTING_CARD_CLASS):
+    # fields: {nama kolom: class elemen}; image: (tag, atribut) untuk URL gambar, mis. ('img', 'src')
+    soup = parse_html(html, parse_only=SoupStrainer('div', attrs={'class': container_class}))    # Parse hanya kartu
+    cards = []
+    for container in soup.find_all('div', attrs={'class': container_class}):
+        card = {}
+        for column, field_class in fields.items():
+            field = container.find(attrs={'class': field_class})
+            card[column] = field.text.strip() if field else None    # Field yang tidak ada diisi None agar kolom tetap sejajar
+        if image:
+            img_tag, img_attr = image
+            img = container.find(img_tag)
+            card['image_url'] = img[img_attr] if img and img.has_attr(img_attr) else None
+        # Kunci properti dari link kartu ke halaman detail, untuk join dengan data halaman detail
+        link = container.find('a', href=lambda href: href and '/property/' in href)
+        card['property_key'] = property_key(link['href']) if link else None
+        cards.append(card)
+    return cards
@@ -0,0 +1,135 @@
+"""Lapisan fetch HTTP untuk scraper: session bersama, paralel terbatas, rate limit per host, retry + backoff."""
+import random       # Mengimpor random untuk jitter backoff
+import threading        # Mengimpor threading untuk lock rate limiter
+import time     # Mengimpor time untuk jeda dan pengukuran waktu
+from concurrent.futures import ThreadPoolExecutor       # Mengimpor thread pool untuk fetch paralel
+from urllib.parse import urlsplit       # Mengimpor urlsplit untuk mengambil host dari URL
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from http_cache import content_hash
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}    # Status HTTP yang layak dicoba ulang
+
+
+class Page:
+    """Isi halaman hasil fetch beserta hash kontennya; ``not_modified`` True jika diambil dari cache (304)."""
+
+    def __init__(self, url, text, content_hash, not_modified=False):
+        self.url = url
+        self.text = text
+        self.content_hash = content_hash
+        self.not_modified = not_modified
+
+
+class HostRateLimiter:
+    """Membatasi jumlah request per detik untuk setiap host."""
+
+    def __init__(self, requests_per_second):
+        self.min_interval = 1.0 / requests_per_second if requests_per_second else 0.0    # Jarak minimum antar request
+        self.next_allowed = {}    # Waktu paling awal request berikutnya per host
+        self.lock = threading.Lock()
+
+    def wait(self, url):
+        if not self.min_interval:
+            return
+        host = urlsplit(url).netloc
+        with self.lock:    # Pesan slot waktu secara atomik agar thread lain mendapat slot berikutnya
+            now = time.monotonic()
+            slot = max(now, self.next_allowed.get(host, now))
+            self.next_allowed[host] = slot + self.min_interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class Fetcher:
+    """Fetch halaman dengan connection pool bersama, timeout, retry dan exponential backoff.
+
+    ``fetch`` mengambil satu URL; ``fetch_all`` mengambil banyak URL secara
+    paralel (maksimal ``max_workers`` sekaligus) dan mengembalikan hasil
+    dengan urutan yang sama seperti input. ``fetch_page`` / ``fetch_pages``
+    memakai ``cache`` (jika ada) untuk conditional GET dan mengembalikan ``Page``.
+    """
+
+    def __init__(self, max_workers=8, requests_per_second=4.0, timeout=30, retries=3, backoff=0.5,
+                 headers=None, session=None, cache=None):
+        self.cache = cache    # ResponseCache opsional untuk conditional GET
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.rate_limiter = HostRateLimiter(requests_per_second)
+
+        # Satu session dengan pool koneksi sebesar jumlah worker agar koneksi dipakai ulang
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if headers:
+            self.session.headers.update(headers)
+
+    def backoff_delay(self, attempt, response=None):
+        # Gunakan Retry-After jika server memberikannya, jika tidak exponential backoff dengan jitter
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return self.backoff * (2 ** attempt) * (0.5 + random.random() / 2)
+
+    def fetch(self, url, headers=None):
+        # Ambil satu URL; mengembalikan response sukses atau melempar requests.RequestException
+        for attempt in range(self.retries + 1):
+            self.rate_limiter.wait(url)
+            try:
+                response = self.session.get(url, timeout=self.timeout, headers=headers)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.retries:
+                    raise
+                time.sleep(self.backoff_delay(attempt))
+                continue
+
+            if response.status_code in RETRY_STATUS_CODES and attempt < self.retries:
+                time.sleep(self.backoff_delay(attempt, response))
+                continue
+            response.raise_for_status()
+            return response
+
+    def fetch_page(self, url):
+        # Ambil satu halaman; dengan cache, halaman yang tidak berubah (304) diambil dari disk
+        headers = self.cache.conditional_headers(url) if self.cache else None
+        response = self.fetch(url, headers=headers)
+        if response.status_code == 304 and self.cache:
+            entry = self.cache.lookup(url)
+            body = self.cache.read_body(entry["content_hash"]) if entry else None
+            if body is not None:
+                self.cache.touch(url)
+                return Page(url, body, entry["content_hash"], not_modified=True)
+            response = self.fetch(url)    # Isi cache hilang: ambil ulang tanpa header conditional
+
+        if self.cache:
+            digest = self.cache.store(url, response.text, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        else:
+            digest = content_hash(response.text)
+        return Page(url, response.text, digest)
+
+    def fetch_all(self, urls):
+        # Ambil banyak URL paralel; tiap hasil berupa response atau exception (urutan sama dengan input)
+        return self._map(self.fetch, urls)
+
+    def fetch_pages(self, urls):
+        # Seperti fetch_all, tetapi menghasilkan Page (memakai cache jika ada)
+        return self._map(self.fetch_page, urls)
+
+    def _map(self, fetch_one, urls):
+        def safe_fetch(url):
+            try:
+                return fetch_one(url)
+            except requests.RequestException as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(safe_fetch, urls))
+
+    def close(self):
+        self.session.close()
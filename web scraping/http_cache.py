@@ -0,0 +1,112 @@
+"""Cache respons HTTP di disk untuk conditional GET dan hasil extractor per hash konten.
+
+Per URL disimpan ETag / Last-Modified dan hash konten terakhir, sehingga
+request berikutnya dikirim dengan ``If-None-Match`` / ``If-Modified-Since``.
+Isi halaman disimpan sekali per hash konten, begitu juga record hasil
+extractor; halaman yang tidak berubah tidak perlu di-download maupun
+di-parse ulang. Jumlah URL dibatasi dengan eviction LRU.
+"""
+import hashlib      # Mengimpor hashlib untuk hash konten
+import json     # Mengimpor json untuk menyimpan record hasil extractor
+import sqlite3      # Mengimpor sqlite3 sebagai penyimpanan cache di disk
+import threading        # Mengimpor threading untuk lock akses dari banyak thread
+import time     # Mengimpor time untuk waktu akses terakhir (LRU)
+
+# Fungsi untuk menghitung hash konten halaman
+def content_hash(content):
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.sha256(content).hexdigest()
+
+
+class ResponseCache:
+    """Cache SQLite: URL -> validator + hash konten, hash -> isi halaman dan record hasil extractor."""
+
+    def __init__(self, path, max_entries=5000):
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT,
+                content_hash TEXT NOT NULL, last_access REAL NOT NULL);
+            CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+            CREATE TABLE IF NOT EXISTS bodies (content_hash TEXT PRIMARY KEY, body TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS records (
+                content_hash TEXT NOT NULL, extractor_version TEXT NOT NULL, record TEXT NOT NULL,
+                PRIMARY KEY (content_hash, extractor_version));
+        """)
+
+    def lookup(self, url):
+        # Validator dan hash konten terakhir untuk URL, atau None
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT etag, last_modified, content_hash FROM entries WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"etag": row[0], "last_modified": row[1], "content_hash": row[2]}
+
+    def conditional_headers(self, url):
+        # Header conditional GET berdasarkan validator yang tersimpan
+        entry = self.lookup(url)
+        headers = {}
+        if entry:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def read_body(self, content_hash):
+        with self.lock:
+            row = self.conn.execute("SELECT body FROM bodies WHERE content_hash = ?", (content_hash,)).fetchone()
+        return row[0] if row else None
+
+    def touch(self, url):
+        # Tandai URL baru saja dipakai (untuk LRU)
+        with self.lock, self.conn:
+            self.conn.execute("UPDATE entries SET last_access = ? WHERE url = ?", (time.time(), url))
+
+    def store(self, url, body, etag=None, last_modified=None):
+        # Simpan respons 200; mengembalikan hash konten
+        digest = content_hash(body)
+        with self.lock, self.conn:
+            self.conn.execute("INSERT OR IGNORE INTO bodies (content_hash, body) VALUES (?, ?)", (digest, body))
+            self.conn.execute(
+                "INSERT OR REPLACE INTO entries (url, etag, last_modified, content_hash, last_access) VALUES (?, ?, ?, ?, ?)",
+                (url, etag, last_modified, digest, time.time()),
+            )
+            self._evict()
+        return digest
+
+    def get_record(self, content_hash, extractor_version):
+        # Record hasil extractor untuk hash konten tertentu, atau None
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT record FROM records WHERE content_hash = ? AND extractor_version = ?",
+                (content_hash, str(extractor_version)),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_record(self, content_hash, extractor_version, record):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO records (content_hash, extractor_version, record) VALUES (?, ?, ?)",
+                (content_hash, str(extractor_version), json.dumps(record)),
+            )
+
+    def _evict(self):
+        # Hapus URL yang paling lama tidak dipakai jika melebihi batas, lalu isi/record yang tidak lagi dirujuk
+        (count,) = self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+        if count <= self.max_entries:
+            return
+        self.conn.execute(
+            "DELETE FROM entries WHERE url IN (SELECT url FROM entries ORDER BY last_access LIMIT ?)",
+            (count - self.max_entries,),
+        )
+        self.conn.execute("DELETE FROM bodies WHERE content_hash NOT IN (SELECT content_hash FROM entries)")
+        self.conn.execute("DELETE FROM records WHERE content_hash NOT IN (SELECT content_hash FROM entries)")
+
+    def close(self):
+        self.conn.close()
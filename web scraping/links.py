@@ -0,0 +1,83 @@
+"""Enumerasi link properti dari halaman listing ``/property/page/N`` lewat HTTP biasa.
+
+Halaman pertama diambil lebih dulu untuk membaca nomor halaman terakhir
+dari pagination (hanya link di dalam container ``.pagination`` yang menuju
+halaman listing yang sama, bukan link ``/page/N`` lain di menu atau blog), lalu halaman lainnya di-download paralel oleh ``Fetcher``.
+Jika nomor halaman terakhir tidak terbaca, halaman diambil per batch
+sampai ada halaman yang gagal atau tidak berisi link baru.
+"""
+import re       # Mengimpor re untuk membaca nomor halaman dari URL pagination
+from urllib.parse import unquote, urljoin, urlsplit        # Mengimpor urljoin/urlsplit untuk membuat dan membaca URL
+
+from bs4 import SoupStrainer
+
+from parsing import parse_html
+
+PAGE_NUMBER = re.compile(r"/page/(\d+)")    # Nomor halaman pada URL pagination
+LISTING_STRAINER = SoupStrainer(['a', 'nav', 'ul'])    # Link beserta container pagination (nav/ul.pagination) dan isinya
+PAGINATION_LINKS = '.pagination a[href]'    # Link nomor halaman di dalam container pagination
+
+# Fungsi untuk membuat kunci kanonik properti dari URL: slug terakhir pada /property/<slug>/
+# (tanpa domain, query, fragment dan slash akhir, huruf kecil) sehingga URL absolut/relatif yang sama menghasilkan kunci sama
+def property_key(url):
+    if not isinstance(url, str):
+        return None
+    slug = unquote(urlsplit(url.strip()).path).rstrip('/').rsplit('/', 1)[-1]
+    return slug.lower() or None
+
+# Fungsi untuk mengambil link properti dan nomor halaman terbesar dari satu halaman listing
+def parse_listing_page(html, base_url):
+    soup = parse_html(html, parse_only=LISTING_STRAINER)    # Hanya link, nav dan ul yang di-parse
+    listing_prefix = base_url.rstrip('/') + '/page/'    # Hanya halaman dari listing ini
+    last_page = 1
+    for a in soup.select(PAGINATION_LINKS):
+        href = urljoin(base_url, a['href'])
+        page_match = PAGE_NUMBER.search(href)
+        if page_match and href.startswith(listing_prefix):
+            last_page = max(last_page, int(page_match.group(1)))
+
+    links = []
+    for a in soup.find_all('a', href=True):
+        href = urljoin(base_url, a['href'])
+        # Sama seperti versi Selenium: hanya link "/property/" dan bukan halaman navigasi
+        if "/property/" in href and "page" not in href and href.rstrip('/') != base_url.rstrip('/'):
+            links.append(href)
+    return links, last_page
+
+# Fungsi untuk menyusun URL halaman listing ke-N
+def listing_page_url(base_url, page):
+    return base_url if page == 1 else f"{base_url.rstrip('/')}/page/{page}/"
+
+# Fungsi untuk mengumpulkan semua link properti unik (urutan kemunculan dipertahankan)
+def enumerate_property_links(fetcher, base_url, max_pages=200):
+    links = {}    # dict sebagai set terurut untuk dedupe O(1)
+
+    def collect(page_links):
+        before = len(links)
+        links.update(dict.fromkeys(page_links))
+        return len(links) - before    # Jumlah link baru
+
+    first_page = fetcher.fetch_page(listing_page_url(base_url, 1))
+    page_links, last_page = parse_listing_page(first_page.text, base_url)
+    collect(page_links)
+
+    if last_page > 1:
+        # Jumlah halaman diketahui: download semua halaman sisanya secara paralel
+        pages = range(2, min(last_page, max_pages) + 1)
+        for page, result in zip(pages, fetcher.fetch_pages([listing_page_url(base_url, p) for p in pages])):
+            if isinstance(result, Exception):
+                print(f"Error accessing listing page {page}: {result}")
+                continue
+            collect(parse_listing_page(result.text, base_url)[0])
+        return list(links)
+
+    # Pagination tidak terbaca: ambil per batch sampai halaman habis
+    page = 2
+    while page <= max_pages:
+        pages = range(page, min(page + fetcher.max_workers, max_pages + 1))
+        results = fetcher.fetch_pages([listing_page_url(base_url, p) for p in pages])
+        for result in results:
+            if isinstance(result, Exception) or collect(parse_listing_page(result.text, base_url)[0]) == 0:
+                return list(links)    # Halaman tidak ada (404) atau tidak berisi link baru
+        page = pages[-1] + 1
+    return list(links)
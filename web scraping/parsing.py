@@ -0,0 +1,19 @@
+"""Pemilihan parser HTML untuk semua extractor.
+
+``lxml`` jauh lebih cepat daripada ``html.parser`` bawaan Python dan dipakai
+jika terpasang. ``parse_only`` (``SoupStrainer``) membatasi parse hanya pada
+elemen yang dibaca extractor, sehingga bagian halaman lain (header, menu,
+script, footer) tidak pernah dibuat menjadi objek BeautifulSoup.
+"""
+from bs4 import BeautifulSoup
+
+# Parser tercepat yang tersedia; html.parser sebagai fallback jika lxml tidak terpasang
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# Fungsi untuk mem-parse HTML dengan parser terpilih (parse_only: SoupStrainer untuk parse sebagian)
+def parse_html(html, parse_only=None, parser=None):
+    return BeautifulSoup(html, parser or HTML_PARSER, parse_only=parse_only)
@@ -0,0 +1,144 @@
+"""Runner pipeline bertahap dengan checkpoint di disk.
+
+Setiap tahap (``Stage``) menerima dict berisi output tahap-tahap yang
+dibutuhkannya dan mengembalikan dict output baru. Output setiap tahap
+disimpan ke ``<checkpoint_dir>/<tahap>/``: DataFrame sebagai Parquet,
+matriks sparse sebagai ``.npz``, selain itu pickle. Dengan begitu run yang
+gagal bisa dilanjutkan dari tahap tertentu (``from_stage``) atau satu
+tahap saja bisa dijalankan ulang (``only_stage``). Tahap yang tidak saling
+bergantung dijalankan paralel.
+"""
+import json     # Mengimpor json untuk manifest checkpoint dan catatan waktu
+import os       # Mengimpor os
+import pickle       # Mengimpor pickle untuk output selain DataFrame / matriks sparse
+import shutil       # Mengimpor shutil untuk mengganti checkpoint lama
+import time     # Mengimpor time untuk mengukur durasi tiap tahap
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait       # Mengimpor thread pool untuk tahap paralel
+
+import pandas as pd
+from scipy import sparse
+
+CHECKPOINT_MANIFEST = "_done.json"    # Ditulis terakhir; checkpoint tanpa file ini dianggap tidak lengkap
+
+
+class Stage:
+    """Satu tahap pipeline: nama, fungsi ``func(inputs) -> dict`` dan nama tahap yang dibutuhkan."""
+
+    def __init__(self, name, func, requires=()):
+        self.name = name
+        self.func = func
+        self.requires = tuple(requires)
+
+
+class Pipeline:
+    """Menjalankan tahap sesuai dependensinya, menyimpan checkpoint dan mencatat durasi tiap tahap."""
+
+    def __init__(self, stages, checkpoint_dir, max_workers=2):
+        self.stages = {stage.name: stage for stage in stages}    # Urutan daftar = urutan tahap
+        self.checkpoint_dir = checkpoint_dir
+        self.max_workers = max_workers
+        self.timings = {}
+
+    def stage_dir(self, name):
+        return os.path.join(self.checkpoint_dir, name)
+
+    def save_checkpoint(self, name, outputs):
+        # Tulis ke folder sementara lalu ganti secara atomik agar checkpoint tidak setengah jadi
+        final_dir = self.stage_dir(name)
+        tmp_dir = final_dir + ".tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+
+        formats = {}
+        for key, value in outputs.items():
+            if isinstance(value, pd.DataFrame):
+                value.to_parquet(os.path.join(tmp_dir, f"{key}.parquet"), index=True)
+                formats[key] = "parquet"
+            elif sparse.issparse(value):
+                sparse.save_npz(os.path.join(tmp_dir, f"{key}.npz"), value.tocsr())
+                formats[key] = "npz"
+            else:
+                with open(os.path.join(tmp_dir, f"{key}.pkl"), "wb") as f:
+                    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+                formats[key] = "pkl"
+        with open(os.path.join(tmp_dir, CHECKPOINT_MANIFEST), "w") as f:
+            json.dump(formats, f)
+
+        shutil.rmtree(final_dir, ignore_errors=True)
+        os.replace(tmp_dir, final_dir)
+
+    def load_checkpoint(self, name):
+        manifest_path = os.path.join(self.stage_dir(name), CHECKPOINT_MANIFEST)
+        if not os.path.exists(manifest_path):
+            raise FileNotFoundError(f"No checkpoint for stage {name!r}; run it first.")
+        with open(manifest_path) as f:
+            formats = json.load(f)
+
+        outputs = {}
+        for key, fmt in formats.items():
+            path = os.path.join(self.stage_dir(name), f"{key}.{fmt}")
+            if fmt == "parquet":
+                outputs[key] = pd.read_parquet(path)
+            elif fmt == "npz":
+                outputs[key] = sparse.load_npz(path)
+            else:
+                with open(path, "rb") as f:
+                    outputs[key] = pickle.load(f)
+        return outputs
+
+    def stages_to_run(self, from_stage=None, only_stage=None):
+        names = list(self.stages)
+        for name in (from_stage, only_stage):
+            if name is not None and name not in self.stages:
+                raise ValueError(f"Unknown stage {name!r}; expected one of {names}.")
+        if only_stage:
+            return [only_stage]
+        if from_stage:
+            return names[names.index(from_stage):]
+        return names
+
+    def run_stage(self, stage, inputs):
+        print(f"[{stage.name}] mulai")
+        start = time.perf_counter()
+        outputs = stage.func(inputs)
+        self.save_checkpoint(stage.name, outputs)
+        self.timings[stage.name] = time.perf_counter() - start
+        print(f"[{stage.name}] selesai dalam {self.timings[stage.name]:.1f} s")
+        return outputs
+
+    def run(self, from_stage=None, only_stage=None):
+        to_run = self.stages_to_run(from_stage, only_stage)
+
+        # Output tahap yang tidak dijalankan ulang diambil dari checkpoint
+        results = {}
+        for name in to_run:
+            for required in self.stages[name].requires:
+                if required not in to_run and required not in results:
+                    results[required] = self.load_checkpoint(required)
+
+        # Jalankan tahap yang dependensinya sudah selesai; tahap yang independen berjalan paralel
+        pending = list(to_run)
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                for name in [name for name in pending if all(r in results for r in self.stages[name].requires)]:
+                    stage = self.stages[name]
+                    inputs = {}
+                    for required in stage.requires:
+                        inputs.update(results[required])
+                    running[executor.submit(self.run_stage, stage, inputs)] = name
+                    pending.remove(name)
+
+                if not running:    # Seharusnya tidak terjadi: dependensi melingkar atau tahap tidak dikenal
+                    raise RuntimeError(f"Stages {pending} cannot run; check their requirements.")
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    results[name] = future.result()    # Error tahap diteruskan; checkpoint tahap sebelumnya tetap ada
+
+        # Simpan catatan durasi tiap tahap di samping checkpoint
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        with open(os.path.join(self.checkpoint_dir, "timings.json"), "w") as f:
+            json.dump(self.timings, f, indent=2)
+        return results
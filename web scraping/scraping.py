@@ -1,17 +1,26 @@
+"""Pipeline scraping Bukit Vista: discover -> fetch -> extract -> merge -> clean -> vectorise -> export.
+
+Setiap tahap menyimpan checkpoint ke disk sehingga run yang gagal bisa
+dilanjutkan. Contoh:
+    python scraping.py                        # semua tahap
+    python scraping.py --from-stage clean     # lanjutkan dari tahap clean
+    python scraping.py --only-stage export    # jalankan ulang satu tahap
+"""
+
 """1. Import library yang dibutuhkan"""
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.by import By
+import argparse
 from zipfile import ZipFile
 from datetime import datetime
-import requests
 import time
 import os
+import json
 import re
+import hashlib
 import numpy as np
 import pandas as pd
+from scipy import sparse
+import pyarrow as pa
+import pyarrow.parquet as pq
 pd.options.display.max_colwidth = 50000
 pd.set_option('display.max_columns', None)
 pd.set_option('display.max_rows', None)
@@ -23,41 +32,59 @@ from nltk.tokenize import word_tokenize
 from nltk.stem import WordNetLemmatizer
 from nltk.stem import PorterStemmer
 from sklearn.feature_extraction.text import TfidfVectorizer
-from tensorflow.keras.preprocessing.text import Tokenizer
+from extractors import (ADDRESS_FIELDS, COMBINED_FIELDS, EXTRACTOR_VERSION, empty_property_record, extract_listing_cards,
+                        extract_property_page)
+from fetcher import Fetcher
+from http_cache import ResponseCache
+from links import enumerate_property_links, property_key
+from pipeline import Pipeline, Stage
+from sequence_encoder import SequenceEncoder
+from text_normalizer import TextNormalizer
+from tfidf_model import latest_tfidf_model_version, load_latest_tfidf_model, new_tfidf_model, save_tfidf_model, vocabulary_coverage
 # from google.colab import files
-nltk.download('punkt')
-nltk.download('wordnet')
-nltk.download('stopwords')
-nltk.download('punkt_tab')
 
 """2. Scraping Title & Image Urls"""
 
-# fungsi untuk scrapping URL gambar dari halaman web
-def scrape_images(base_url, pages, img_tag, img_attr, container_class='d-flex align-items-center h-100'):
-    image_urls = []   # List untuk menyimpan URL gambar
-    for page in range(1, pages + 1):    # Loop melalui setiap halaman yang ingin di-scrape
-        url = f"{base_url}/page/{page}"   # Menyusun URL untuk setiap halaman
-        response = requests.get(url)    # Mengirimkan request HTTP ke halaman
-        soup = BeautifulSoup(response.text, 'html.parser')    # Menggunakan BeautifulSoup untuk parsing HTML
-        div_containers = soup.find_all('div', attrs={'class': container_class})    # Menemukan semua elemen div yang memiliki kelas CSS yang ditentukan
-        for container in div_containers:    # Loop untuk setiap div yang ditemukan untuk mengekstrak gambar
-            img = container.find(img_tag)   # Mencari tag gambar dalam div
-            if img and img.has_attr(img_attr):    # Memastikan tag gambar memiliki atribut yang diinginkan
-                image_urls.append(img[img_attr])    # Menambahkan URL gambar ke dalam list
-    return image_urls   # Mengembalikan list URL gambar yang ditemukan
-
-# Fungsi untuk scrapping judul properti dari halaman web
-def scrape_property_title(base_url, pages, field_class, container_class='d-flex align-items-center h-100'):
-    data = []   # List untuk menyimpan judul properti
-    for page in range(1, pages + 1):    # Loop untuk setiap halaman
-        url = f"{base_url}/page/{page}"   # Menyusun URL untuk setiap halaman
-        response = requests.get(url)    # Mengirimkan request ke halaman
-        soup = BeautifulSoup(response.text, 'html.parser')    # Parsing HTML
-        div_containers = soup.find_all('div', attrs={'class': container_class})  # Menemukan semua kontainer
-        for container in div_containers:    # Loop untuk setiap kontainer
-            field = container.find(attrs={'class': field_class})    # Menemukan elemen dengan kelas field_class
-            data.append(field.text.strip() if field else None)    # Menambahkan judul ke dalam list
-    return data   # Mengembalikan daftar judul properti
+# Pengaturan fetch HTTP: jumlah request paralel, batas request per detik per host, timeout dan retry
+MAX_WORKERS = 8
+REQUESTS_PER_SECOND = 4.0
+REQUEST_TIMEOUT = 30
+REQUEST_RETRIES = 3
+
+# Cache respons HTTP di disk (conditional GET + record hasil extractor per hash konten)
+HTTP_CACHE_PATH = "http_cache.sqlite"
+HTTP_CACHE_MAX_ENTRIES = 5000
+
+# Satu fetcher (connection pool bersama) untuk semua tahap scraping; dibuat oleh open_fetcher()
+response_cache = None
+fetcher = None
+
+# Fungsi untuk membuka cache respons dan fetcher bersama
+def open_fetcher():
+    global response_cache, fetcher
+    response_cache = ResponseCache(HTTP_CACHE_PATH, max_entries=HTTP_CACHE_MAX_ENTRIES)
+    fetcher = Fetcher(max_workers=MAX_WORKERS, requests_per_second=REQUESTS_PER_SECOND,
+                      timeout=REQUEST_TIMEOUT, retries=REQUEST_RETRIES, cache=response_cache)
+
+# Fungsi untuk men-download halaman listing /page/1..pages secara paralel
+def fetch_listing_pages(base_url, pages):
+    urls = [f"{base_url}/page/{page}" for page in range(1, pages + 1)]   # Menyusun URL untuk setiap halaman
+    html_pages = []
+    for url, page in zip(urls, fetcher.fetch_pages(urls)):
+        if isinstance(page, Exception):    # Halaman yang gagal dilewati
+            print(f"Error accessing URL {url}: {page}")
+            continue
+        html_pages.append(page.text)
+    return html_pages
+
+# Fungsi untuk scraping kartu properti di halaman listing: setiap halaman di-download dan di-parse sekali untuk semua field
+def scrape_listing(base_url, pages, fields, image=None):
+    cards = []
+    for html in fetch_listing_pages(base_url, pages):
+        cards.extend(extract_listing_cards(html, fields, image))
+    # Satu baris per kartu, sehingga kolom selalu sejajar walaupun ada field yang kosong
+    columns = list(fields) + (['image_url'] if image else []) + ['property_key']
+    return pd.DataFrame(cards, columns=columns)
 
 # Scraping data untuk properti di berbagai lokasi
 locations = {
@@ -66,51 +93,58 @@ locations = {
     "Yogyakarta": "https://www.bukitvista.com/city/yogyakarta",
 }
 
-# List untuk menyimpan data properti dari semua lokasi
-all_properties = []
+# Fungsi untuk scraping judul dan URL gambar properti dari semua lokasi
+def scrape_location_properties(locations):
+    # Judul dan gambar diambil dari kartu yang sama pada satu kali download per halaman
+    all_properties = [scrape_listing(url, 5, {'title': 'item-title'}, image=('img', 'src')) for url in locations.values()]
 
-# Looping melalui setiap lokasi untuk melakukan scraping
-for location, url in locations.items():
-    titles = scrape_property_title(url, 5, 'item-title')    # Scraping judul properti
-    image_urls = scrape_images(url, 5, 'img', 'src')    # Scraping URL gambar properti
+    # Menggabungkan semua hasil scraping dari berbagai lokasi menjadi satu DataFrame
+    return pd.concat(all_properties, axis=0).reset_index(drop=True)
 
-    # Membuat DataFrame untuk menyimpan data properti di berbagai lokasi
-    property_df = pd.DataFrame({
-        'title': titles,          # Kolom untuk judul properti
-        'image_url': image_urls   # Kolom untuk URL gambar properti
-    })
+"""3. Scraping Property "Uluwatu Modern Boho Villa Near Nyang Nyang Beach"""
 
-    all_properties.append(property_df)    # Menambahkan DataFrame ke dalam list
+# Field kartu listing untuk properti island-life: nama kolom -> class elemen
+ULUWATU_LISTING_FIELDS = {
+    'title': 'item-title',    # Judul properti
+    'tags': 'labels-wrap labels-right',    # Kategori/tag properti
+    'price': 'item-price item-price-text',    # Harga properti
+    'property_type': 'h-type',    # Tipe properti
+    'address_detail': 'item-address',    # Alamat properti
+}
 
-# Menggabungkan semua hasil scraping dari berbagai lokasi menjadi satu DataFrame
-images_title_df = pd.concat(all_properties, axis=0).reset_index(drop=True)
+# Fungsi untuk scraping data properti "Uluwatu Modern Boho Villa Near Nyang Nyang Beach"
+def scrape_uluwatu_property():
+    uluwatu_property = scrape_listing('https://www.bukitvista.com/property-type/island-life', 1, ULUWATU_LISTING_FIELDS)
+    # Menampilkan jumlah properti yang berhasil di-scrape
+    print('Total properties:', len(uluwatu_property))
 
-# Menampilkan DataFrame hasil scraping
-images_title_df
+    # Hanya mengambil data property "Uluwatu Modern Boho Villa Near Nyang Nyang Beach"
+    return uluwatu_property[uluwatu_property['title'] != "Bingin Beach Hideaway: Group Villa with Pool & BBQ"]
 
-"""3. Scraping Property "Uluwatu Modern Boho Villa Near Nyang Nyang Beach"""
+"""4. Scraping URL"""
+
+# Link properti diambil lewat HTTP biasa; Selenium (headless Chrome) hanya dipakai jika diaktifkan
+USE_SELENIUM = False
+LISTING_MAX_PAGES = 200    # Batas jumlah halaman listing yang ditelusuri
 
-# Scraping data untuk properti "Uluwatu Modern Boho Villa Near Nyang Nyang Beach"
-uluwatu_property = pd.DataFrame({
-    'title': scrape_property_title('https://www.bukitvista.com/property-type/island-life', 1, 'item-title'),    # Scraping judul properti
-    'tags': scrape_property_title('https://www.bukitvista.com/property-type/island-life', 1, 'labels-wrap labels-right'),   # Scraping kategori/tag properti
-    'price': scrape_property_title('https://www.bukitvista.com/property-type/island-life', 1, 'item-price item-price-text'),    # Scraping harga properti
-    'property_type': scrape_property_title('https://www.bukitvista.com/property-type/island-life', 1, 'h-type'),    # Scraping tipe properti
-    'address_detail': scrape_property_title('https://www.bukitvista.com/property-type/island-life', 1, 'item-address'),   # Scraping alamat properti
-})
-# Menampilkan jumlah properti yang berhasil di-scrape
-print('Total properties:', len(uluwatu_property))
+# Fungsi untuk scraping href yang berada di "https://www.bukitvista.com/property/" tanpa browser
+def scrape_property_links(url: str) -> pd.DataFrame:
+    if USE_SELENIUM:
+        return scrape_property_links_selenium(url)
 
-# Menampilkan DataFrame
-uluwatu_property
+    # Halaman /property/page/N di-download paralel, link unik dikumpulkan dengan set
+    links = enumerate_property_links(fetcher, url, max_pages=LISTING_MAX_PAGES)
+    df = pd.DataFrame(links, columns=["property_links"])
 
-# Hanya mengambil data property "Uluwatu Modern Boho Villa Near Nyang Nyang Beach"
-uluwatu_property = uluwatu_property[uluwatu_property['title'] != "Bingin Beach Hideaway: Group Villa with Pool & BBQ"]
+    # Menampilkan jumlah url yang berhasil di-scrape
+    print('Total url:', len(df))
+    return df
 
-"""4. Scraping URL"""
+# Fallback Selenium: navigasi pagination dengan tombol "Next" di headless Chrome
+def scrape_property_links_selenium(url: str) -> pd.DataFrame:
+    from selenium import webdriver    # Diimpor saat dibutuhkan agar scraping tanpa Selenium tidak memerlukan Chrome
+    from selenium.webdriver.common.by import By
 
-# fungsi untuk scraping href yang berada di "https://www.bukitvista.com/property/"
-def scrape_property_links(url: str) -> pd.DataFrame:
     # Membuat instance dari Chrome WebDriver dengan konfigurasi khusus
     option = webdriver.ChromeOptions()
     option.add_argument("--start-maximized")  # Membuka jendela browser Chrome dalam mode layar penuh
@@ -126,8 +160,8 @@ def scrape_property_links(url: str) -> pd.DataFrame:
     # Tunggu halaman termuat
     time.sleep(3)
 
-    # List untuk menyimpan url properti
-    links = []
+    # Dict sebagai set terurut untuk menyimpan url properti unik
+    links = {}
 
     # Loop untuk navigasi pagination
     while True:
@@ -139,8 +173,8 @@ def scrape_property_links(url: str) -> pd.DataFrame:
             # Ambil nilai atribut 'href' dari elemen <a>
             href = link.get_attribute("href")
             # Hanya tambahkan tautan unik dan hindari tautan ke halaman navigasi
-            if href and href not in links and "page" not in href:
-                links.append(href)
+            if href and "page" not in href:
+                links[href] = None
 
         # Coba cari tombol 'Next' untuk navigasi ke halaman berikutnya
         try:
@@ -152,7 +186,7 @@ def scrape_property_links(url: str) -> pd.DataFrame:
             break
 
     # Masukkan tautan ke DataFrame
-    df = pd.DataFrame(links, columns=["property_links"])
+    df = pd.DataFrame(list(links), columns=["property_links"])
 
     # Menghapus url https://www.bukitvista.com/property/ dari DataFrame
     df = df[df["property_links"] != "https://www.bukitvista.com/property/"].reset_index(drop=True)
@@ -169,279 +203,83 @@ def scrape_property_links(url: str) -> pd.DataFrame:
 # Definisikan url
 bukit_vista_url = "https://www.bukitvista.com/property/"
 
-# Panggil dan terapkan fungsi
-url_df = scrape_property_links(bukit_vista_url)
-
-"""5. Scraping Title, Address & Tags"""
-
-# Fungsi untuk melakukan scraping data properti dari URL
-def scrape_property_combined(url_df, container_class='container'):
-    # List untuk menyimpan data hasil scraping
-    data = []
-
-    # Iterasi setiap URL dalam kolom 'property_links' pada DataFrame
-    for url in url_df["property_links"]:
-        try:
-            # Melakukan permintaan HTTP GET ke URL
-            response = requests.get(url, timeout=30)
-
-            # Memastikan permintaan berhasil
-            response.raise_for_status()
-
-            # Parsing HTML dari respons menggunakan BeautifulSoup
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # Mencari semua elemen <div> dengan atribut 'class' yang sesuai
-            div_containers = soup.find_all('div', attrs={'class': container_class})
-
-            # Inisialisasi variabel untuk menyimpan data yang akan diambil
-            title = None
-            address = None
-            tags = None
-
-            # Iterasi melalui setiap container untuk mengekstrak data
-            for container in div_containers:
-                # Mencari elemen dengan kelas 'page-title' untuk judul properti
-                if title is None:
-                    title_element = container.find(attrs={'class': 'page-title'})
-                    # Ambil teks dari elemen jika ditemukan, jika tidak, tetap None
-                    title = title_element.text.strip() if title_element else None
-
-                # Mencari elemen dengan kelas 'item-address' untuk alamat properti
-                if address is None:
-                    address_element = container.find(attrs={'class': 'item-address'})
-                    # Ambil teks dari elemen jika ditemukan, jika tidak, tetap None
-                    address = address_element.text.strip() if address_element else None
-
-                # Mencari elemen dengan kelas 'property-labels-wrap' untuk label properti
-                if tags is None:
-                    tags_element = container.find(attrs={'class': 'property-labels-wrap'})
-                    # Ambil teks dari elemen jika ditemukan, jika tidak, tetap None
-                    tags = tags_element.text.strip() if tags_element else None
-
-            # Tambahkan data hasil scraping ke list dalam bentuk dictionary
-            data.append({'title': title, 'address': address, 'tags': tags})
-
-        # Menangkap error yang terjadi saat melakukan permintaan HTTP
-        except requests.RequestException as e:
-            # Cetak pesan error dan URL yang bermasalah
-            print(f"Error accessing URL {url}: {e}")
-            # Tambahkan data kosong untuk URL yang gagal
-            data.append({'title': None, 'address': None, 'tags': None})
-
-    # Mengembalikan data hasil scraping dalam bentuk DataFrame
-    return pd.DataFrame(data)
-
-# Scrape semua data properti dari DataFrame 'url_df'
-property_data = scrape_property_combined(url_df)
-
-"""6. Scraping Property Details"""
-
-# Fungsi untuk melakukan scraping berdasarkan elemen <strong> dan <span>
-def property_details(url, container_class='detail-wrap'):
-    # Dictionary untuk menyimpan data hasil scraping
-    data = {}
-
-    # Melakukan permintaan HTTP GET ke URL
-    response = requests.get(url)
-
-    # Parsing HTML dari respons menggunakan BeautifulSoup
-    soup = BeautifulSoup(response.text, 'html.parser')
-
-    # Mencari container utama
-    div_container = soup.find('div', class_=container_class)
-    if div_container:
-        # Mencari semua elemen <li>
-        fields = div_container.find_all('li')
-        for field in fields:
-            # Mengambil teks dari elemen <strong> dan <span>
-            strong = field.find('strong')
-            span = field.find('span')
-            if strong and span:
-                # Standarisasi nama kolom
-                column_name = standardize_column_name(strong.text.strip())
-                data[column_name] = span.text.strip()  # Nilai berdasarkan <span>
-
-    # Mengembalikan data hasil scrapping
-    return data
-
-# Fungsi untuk standarisasi nama kolom
-def standardize_column_name(column_name):
-    # Ubah nama kolom menjadi lowercase
-    column_name = column_name.lower()
-    # Ganti bentuk jamak dengan bentuk singular (bedrooms -> bedroom, dll.)
-    replacements = {
-        'bedrooms': 'bedroom',
-        'bathrooms': 'bathroom',
-        'rooms': 'room'
-    }
-
-    # Looping melalui semua pasangan key-value dalam dictionary `replacements`
-    for key, value in replacements.items():
-        # Mengganti setiap kemunculan 'key' dalam 'column_name' dengan 'value'
-        column_name = column_name.replace(key, value)
-
-    # Hapus karakter tidak diinginkan seperti ':', spasi ekstra, atau simbol lainnya
-    column_name = ''.join(char for char in column_name if char.isalnum() or char == ' ')
-    column_name = column_name.strip().replace(' ', '_')  # Ganti spasi dengan underscore
-
-    # Mengembalikan 'column_name' yang telah diperbarui setelah semua penggantian selesai
-    return column_name
-
-# DataFrame untuk menyimpan hasil scraping
-all_properties = []
-
-# Loop melalui setiap URL dalam url_df
-for index, row in url_df.iterrows():
-    # Mengambil URL dari kolom 'property_links' pada baris saat ini
-    url = row['property_links']
-    # Memanggil fungsi 'property_details' untuk melakukan scraping data dari URL
-    scraped_data = property_details(url)
-    # Menambahkan data yang telah di-scrape ke dalam list 'all_properties'
-    all_properties.append(scraped_data)
-
-# Membuat DataFrame akhir
-detail_properties = pd.DataFrame(all_properties)
-
-"""7. Scraping Property Description"""
-
-# Fungsi untuk scraping property description
-def scrape_property_descriptions(urls):
-  # List untuk menyimpan data hasil scraping
-  results = []
-
-  # Iterasi melalui setiap URL dalam kolom 'property_links'
-  for url in url_df["property_links"]:
-      # Mengirim permintaan ke halaman website
-      response = requests.get(url)
-
-      # Parsing HTML dari respons menggunakan BeautifulSoup
-      soup = BeautifulSoup(response.text, 'html.parser')
-
-      # Membatasi pencarian hanya pada container 'block-content-wrap'
-      container = soup.find('div', class_='block-content-wrap')
-
-      # Mengecek apakah container ditemukan
-      if container:
-          # Inisialisasi struktur data untuk menyimpan hasil
-          data = []
-          current_header = None
-
-          # Iterasi melalui elemen-elemen dalam container
-          for element in container.find_all(['h1', 'h2', 'h3', 'p', 'li']):
-              if element.name in ['h1', 'h2', 'h3']:
-                  # Menetapkan header baru jika elemen adalah h1, h2, atau h3
-                  current_header = element.text.strip().lower()
-              elif element.name in ['p', 'li']:
-                  # Menambahkan teks dari elemen 'p' atau 'li' ke data
-                  if current_header:
-                      # Jika ada header, tambahkan ke data dengan header yang relevan
-                      data.append({"header": current_header, "text": element.text.strip()})
-                  else:
-                      # Jika tidak ada header sebelumnya, gunakan 'others' sebagai header default
-                      data.append({"header": "others", "text": element.text.strip()})
-
-          # Memproses data menjadi dictionary yang mengelompokkan teks berdasarkan header
-          df_dict = {}
-          # Iterasi melalui setiap elemen dalam daftar 'data'
-          for item in data:
-              # Memeriksa apakah value dalam key 'header' dari 'item' belum ada dalam dictionary 'df_dict'
-              if item["header"] not in df_dict:
-                  # Menambahkan header baru jika belum ada dalam dictionary
-                  df_dict[item["header"]] = []
-              # Menambahkan teks untuk header yang sesuai
-              df_dict[item["header"]].append(item["text"])
-
-          # Menggabungkan isi kolom menjadi satu string untuk setiap kolom (header)
-          df_dict = {key: "\n\n".join(values) for key, values in df_dict.items()}
-
-          # Menambahkan hasil ke daftar
-          results.append(df_dict)
-      else:
-          # Jika container tidak ditemukan, cetak pesan error dan tambahkan dictionary kosong
-          print(f"Container tidak ditemukan untuk URL: {url}")
-          results.append({})  # Tambahkan dictionary kosong jika container tidak ditemukan
-
-  # Mengembalikan DataFrame hasil
-  return pd.DataFrame(results)
-
-# Menerapkan fungsi
-property_description = scrape_property_descriptions(url_df["property_links"])
-
-"""8. Scraping Address Details"""
-
-# Fungsi untuk melakukan scraping data address dari URL
-def address_details(url_df, container_class='list-2-cols list-unstyled'):
-    # List untuk menyimpan data hasil scraping
-    data = []
-
-    # Iterasi setiap URL dalam kolom 'property_links' pada DataFrame
-    for url in url_df["property_links"]:
-        try:
-            # Melakukan permintaan HTTP GET ke URL
-            response = requests.get(url, timeout=30)
-
-            # Memastikan permintaan berhasil
-            response.raise_for_status()
-
-            # Parsing HTML dari respons menggunakan BeautifulSoup
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # Mencari elemen <ul> dengan class container_class yang sesuai
-            ul_container = soup.find('ul', attrs={'class': container_class})
-
-            # Inisialisasi variabel untuk menyimpan data yang akan diambil
-            address = None
-            city = None
-            state = None
-            zip_code = None
-            area = None
-            country = None
-
-            # Jika <ul> ditemukan, lanjutkan mencari elemen <span> dalam <li> tertentu
-            if ul_container:
-                # Mencari elemen <li> dengan kelas tertentu dan ambil teks dari <span>
-                for li in ul_container.find_all('li'):
-                    span_element = li.find('span')
-                    if span_element:
-                        # Tentukan data berdasarkan class dari <li> untuk penandaan
-                        if 'detail-address' in li.get('class', []):
-                            address = span_element.text.strip()
-                        elif 'detail-city' in li.get('class', []):
-                            city = span_element.text.strip()
-                        elif 'detail-state' in li.get('class', []):
-                            state = span_element.text.strip()
-                        elif 'detail-zip' in li.get('class', []):
-                            zip_code = span_element.text.strip()
-                        elif 'detail-area' in li.get('class', []):
-                            area = span_element.text.strip()
-                        elif 'detail-country' in li.get('class', []):
-                            country = span_element.text.strip()
-
-            # Tambahkan data hasil scraping ke list dalam bentuk dictionary
-            data.append({'address_detail': address, 'city': city, 'state': state, 'zip_code': zip_code, 'area': area, 'country': country})
-
-        # Menangkap error yang terjadi saat melakukan permintaan HTTP
-        except requests.RequestException as e:
-            # Cetak pesan error dan URL yang bermasalah
-            print(f"Error accessing URL {url}: {e}")
-            # Tambahkan data kosong untuk URL yang gagal
-            data.append({'address_detail': None, 'city': None, 'state': None, 'zip_code': None, 'area': None, 'country': None})
-
-    # Mengembalikan data hasil scraping dalam bentuk DataFrame
-    return pd.DataFrame(data)
-
-# Scrape semua data properti dari DataFrame 'url_df'
-property_address_details = address_details(url_df)
-
-"""9. Concat The DataFrame"""
+"""5. Scraping Property Pages (Title, Address, Tags, Details, Description & Address Details)"""
+
+# Fungsi untuk men-download setiap halaman properti sekali; isi halaman disimpan di cache respons per hash konten
+def fetch_property_pages(url_df):
+    # Download semua URL secara paralel (timeout, retry, rate limit dan conditional GET ditangani fetcher)
+    urls = list(url_df["property_links"])
+    content_hashes = []
+    for url, page in zip(urls, fetcher.fetch_pages(urls)):
+        if isinstance(page, Exception):
+            # Cetak pesan error dan URL yang bermasalah; URL yang gagal tidak punya hash konten
+            print(f"Error accessing URL {url}: {page}")
+            content_hashes.append(None)
+        else:
+            content_hashes.append(page.content_hash)
+    return pd.DataFrame({"property_links": urls, "content_hash": content_hashes})
+
+# Fungsi untuk menjalankan semua extractor pada halaman hasil fetch (satu parse per halaman)
+def extract_property_records(pages):
+    # List untuk menyimpan satu record per URL
+    records = []
+
+    for url, digest in zip(pages["property_links"], pages["content_hash"]):
+        if digest is None:
+            record = empty_property_record()    # Data kosong untuk URL yang gagal di-download
+        else:
+            # Halaman dengan konten yang sama tidak di-parse ulang: record diambil dari cache
+            record = response_cache.get_record(digest, EXTRACTOR_VERSION)
+            if record is None:
+                html = response_cache.read_body(digest)
+                if html is None:    # Isi halaman sudah tidak ada di cache: download ulang
+                    page, = fetcher.fetch_pages([url])    # Page atau exception, seperti di fetch_property_pages
+                    if isinstance(page, Exception):
+                        print(f"Error accessing URL {url}: {page}")
+                    else:
+                        digest, html = page.content_hash, page.text
+                if html is None:
+                    record = empty_property_record()    # Download ulang gagal: data kosong, crawl tetap lanjut
+                else:
+                    # Parsing HTML sekali dan jalankan semua extractor pada hasil parse yang sama
+                    record = extract_property_page(html)
+                    response_cache.put_record(digest, EXTRACTOR_VERSION, record)
+
+        if record['description'] is None:
+            print(f"Container tidak ditemukan untuk URL: {url}")
+
+        records.append(record)
+
+    # Mengembalikan satu record per URL
+    return records
+
+# Fungsi untuk memecah record hasil crawl menjadi DataFrame per bagian, masing-masing ber-index property_key
+def split_property_records(records, keys):
+    index = pd.Index(keys, name='property_key')
+    property_data = pd.DataFrame([record['combined'] for record in records], columns=COMBINED_FIELDS, index=index)
+    detail_properties = pd.DataFrame([record['details'] for record in records], index=index)
+    property_description = pd.DataFrame([record['description'] or {} for record in records], index=index)
+    property_address_details = pd.DataFrame([record['address'] for record in records], columns=ADDRESS_FIELDS, index=index)
+    return property_data, detail_properties, property_description, property_address_details
+
+"""9. Join The DataFrame by Property Key"""
+
+# Fungsi untuk membuat lookup kolom per property_key (kunci kosong dibuang, kunci ganda memakai entri pertama)
+def key_lookup(df, column, key='property_key'):
+    keyed = df.dropna(subset=[key]).drop_duplicates(subset=[key], keep='first')
+    return pd.Series(keyed[column].to_numpy(), index=pd.Index(keyed[key], name=key))
 
 # Fungsi untuk menggabungkan beberapa DataFrame properti Bukit Vista, membersihkan data kosong, dan menambahkan URL gambar berdasarkan judul properti.
 def process_bukit_vista_data(url_df, property_data, detail_properties, property_address_details,
                               uluwatu_property, images_title_df):
 
-  # Menggabungkan beberapa DataFrame yang diperlukan
-  bukit_vista_property = pd.concat([url_df, property_data, detail_properties, property_address_details], axis=1)
+  # Satu baris per property_key; URL yang berbeda untuk properti yang sama (slash, query, huruf besar) digabung
+  url_df = url_df.assign(property_key=url_df['property_links'].map(property_key))
+  url_df = url_df.dropna(subset=['property_key']).drop_duplicates(subset=['property_key']).set_index('property_key')
+
+  # Menggabungkan semua bagian berdasarkan index property_key (hash join, bukan berdasarkan urutan baris)
+  parts = [part[~part.index.duplicated()] for part in (property_data, detail_properties, property_address_details)]
+  bukit_vista_property = pd.concat([url_df] + parts, axis=1, join='outer').reindex(url_df.index)
 
   # Mengecek jumlah data duplikat berdasarkan kolom 'title' dan 'property_id'
   duplicates_data = bukit_vista_property.duplicated(subset=['title','property_id']).sum()
@@ -450,79 +288,91 @@ def process_bukit_vista_data(url_df, property_data, detail_properties, property_
   print(f"Jumlah duplikat berdasarkan title: {duplicates_data}")
 
   # Menghapus data duplikat berdasarkan kolom 'title' dan 'property_id', menyimpan entri pertama dan menghapus yang lainnya
-  bukit_vista_property = bukit_vista_property.drop_duplicates(subset=['title','property_id'], keep='first')
+  bukit_vista_property = bukit_vista_property.drop_duplicates(subset=['title','property_id'], keep='first').reset_index()
 
   # Mengganti nilai kosong ('') dengan NaN pada beberapa kolom untuk mempermudah identifikasi
   for col in ['title', 'tags', 'address_detail']:
       if col in bukit_vista_property.columns:
           bukit_vista_property[col] = bukit_vista_property[col].replace('', np.nan)
 
- # Mengisi data yang kosong pada baris pertama menggunakan data dari uluwatu_property jika tersedia
-  if not uluwatu_property.empty:
-    first_row_uluwatu = uluwatu_property.iloc[0]    # Ambil baris pertama dari uluwatu_property
-    bukit_vista_property.iloc[0] = bukit_vista_property.iloc[0].fillna(first_row_uluwatu)   # Isi NaN dengan data ini
+  # Mengisi data yang kosong menggunakan kartu listing uluwatu_property dengan property_key yang sama
+  for column in uluwatu_property.columns.drop('property_key'):
+    if column in bukit_vista_property.columns:
+      bukit_vista_property[column] = bukit_vista_property[column].fillna(
+          bukit_vista_property['property_key'].map(key_lookup(uluwatu_property, column)))
 
-  # Menggabungkan kolom image_url dari images_title_df ke bukit_vista_property berdasarkan kolom title
-  if 'title' in images_title_df.columns and 'title' in bukit_vista_property.columns:
-    bukit_vista_property = bukit_vista_property.merge(
-        images_title_df[['title', 'image_url']],  # Pilih hanya kolom 'title' dan 'image_url'
-        on='title',  # Gabungkan berdasarkan kolom title
-        how='left'  # Gunakan 'left' agar data di bukit_vista_property tetap ada
-    )
+  # Menambahkan kolom image_url dari kartu listing berdasarkan property_key;
+  # kartu tanpa link properti dicocokkan berdasarkan judul seperti sebelumnya
+  bukit_vista_property['image_url'] = bukit_vista_property['property_key'].map(key_lookup(images_title_df, 'image_url'))
+  if 'title' in bukit_vista_property.columns:
+    bukit_vista_property['image_url'] = bukit_vista_property['image_url'].fillna(
+        bukit_vista_property['title'].map(key_lookup(images_title_df, 'image_url', key='title')))
 
   # Mengembalikan DataFrame hasil penggabungan
   return bukit_vista_property
 
-# Memanggil fungsi untuk memproses data Bukit Vista
-bukit_vista_property = process_bukit_vista_data(url_df, property_data, detail_properties,
-                                                property_address_details, uluwatu_property, images_title_df)
-
-# Fungsi untuk menambahkan kolom 'title' dari bukit_vista_property ke property_description berdasarkan urutan
+# Fungsi untuk menambahkan kolom 'title' dari bukit_vista_property ke property_description berdasarkan property_key
 def add_title_to_description(property_description, bukit_vista_property):
-    return property_description.assign(title=bukit_vista_property['title']) # Mengembalikan property_description
-
-# Memanggil fungsi
-property_description = add_title_to_description(property_description, bukit_vista_property)
+    property_description = property_description[~property_description.index.duplicated()]    # Satu deskripsi per properti
+    titles = property_description.index.map(key_lookup(bukit_vista_property, 'title'))
+    return property_description.assign(title=titles).reset_index()    # property_key menjadi kolom biasa
 
 """10. Data Cleaning"""
 
-# Fungsi untuk mengisi kolom 'tags' berdasarkan informasi 'address_detail'
-def fill_tags(row):
-    if pd.isna(row['tags']):    # Mengecek apakah kolom 'tags' bernilai NaN (kosong)
-        address_detail = str(row['address_detail']).lower()   # Mengambil detail alamat dan mengubahnya menjadi huruf kecil untuk perbandingan
-        # Menentukan nilai 'tags' berdasarkan kata kunci dalam 'address_detail'
-        if "bali" in address_detail:    # Jika mengandung kata "bali"
-            return "Bali Vacation Rental"
-        elif "nusa penida" in address_detail:   # Jika mengandung kata "nusa penida"
-            return "Nusa Penida Vacation Rental"
-        elif "yogyakarta" in address_detail:    # Jika mengandung kata "yogyakarta"
-            return "Yogyakarta Vacation Rental"
-    return row['tags']    # Jika 'tags' sudah diisi atau tidak ada kata kunci yang cocok, kembalikan nilai asli
+# Pola regex yang dipakai data cleaning, dikompilasi sekali
+WHITESPACE_PATTERN = re.compile(r"\s+")
+USD_PRICE_PATTERN = re.compile(r'(\d+[\.,]?\d*)')
+RUPIAH_PRICE_PATTERN = re.compile(r'Rp\s*([\d\.]+)')
+RENTAL_PERIOD_PATTERN = re.compile(r'per (.+)$')
+RUPIAH_PER_USD = 16244    # Kurs konversi Rupiah ke USD
+
+# Fungsi untuk mengisi kolom 'tags' yang kosong berdasarkan kata kunci pada 'address_detail'
+def fill_tags(tags, address_detail):
+    # Categorical agar pencocokan kata kunci hanya dijalankan sekali per alamat unik
+    address_detail = address_detail.astype(str).str.lower().astype('category')
+    missing = tags.isna()    # Hanya 'tags' yang kosong (NaN) yang diisi
+    conditions = [
+        missing & address_detail.str.contains("bali", regex=False),
+        missing & address_detail.str.contains("nusa penida", regex=False),
+        missing & address_detail.str.contains("yogyakarta", regex=False),
+    ]
+    choices = ["Bali Vacation Rental", "Nusa Penida Vacation Rental", "Yogyakarta Vacation Rental"]
+    # Kondisi pertama yang cocok dipakai; jika tidak ada yang cocok, nilai asli dipertahankan
+    return pd.Series(np.select(conditions, choices, default=tags.to_numpy(dtype=object)), index=tags.index)
 
 # Fungsi untuk mengklasifikasikan jenis properti berdasarkan kata-kata kunci tertentu yang terdapat dalam 'property_type'
 def extract_class_property(property_type):
-    # Mengubah nilai property_type menjadi huruf kecil agar pencocokan tidak sensitif terhadap kapitalisasi
-    property_type = property_type.lower()
-    # Memeriksa apakah kata 'guest house' terdapat dalam property_type
-    if 'guest house' in property_type:
-        return 'guest house'
-    # Memeriksa apakah kata 'residential' terdapat dalam property_type
-    elif 'residential' in property_type:
-        return 'residential'
-    # Memeriksa apakah kata 'villa' terdapat dalam property_type
-    elif 'villa' in property_type:
-        return 'villa'
-    # Jika tidak ada kecocokan, kembalikan None
-    return None
-
-# Inisialisasi stopwords
-stop_words = set(stopwords.words('english'))
+    # Huruf kecil agar pencocokan tidak sensitif terhadap kapitalisasi (categorical: sekali per tipe unik)
+    property_type = property_type.str.lower().astype('category')
+    conditions = [
+        property_type.str.contains('guest house', regex=False),
+        property_type.str.contains('residential', regex=False),
+        property_type.str.contains('villa', regex=False),
+    ]
+    # Jika tidak ada kecocokan, hasilnya None
+    return pd.Series(np.select(conditions, ['guest house', 'residential', 'villa'], default=None), index=property_type.index)
+
+# Inisialisasi stopwords dan normalizer teks (diisi oleh prepare_nltk sebelum tahap clean)
+stop_words = set()
+text_normalizer = None
+NORMALIZER_PROCESSES = None    # Isi jumlah proses (mis. 4) untuk membagi batch teks yang besar
 # Inisialisasi stemmer
 ps = PorterStemmer()
 # Inisialisasi lemmatizer
 lemmatizer = WordNetLemmatizer()
 
+# Fungsi untuk men-download data NLTK dan memuat stopwords
+def prepare_nltk():
+    global stop_words, text_normalizer
+    nltk.download('punkt')
+    nltk.download('wordnet')
+    nltk.download('stopwords')
+    nltk.download('punkt_tab')
+    stop_words = set(stopwords.words('english'))
+    text_normalizer = TextNormalizer(stop_words, processes=NORMALIZER_PROCESSES)
+
 # Fungsi untuk membersihkan teks dan mempersiapkannya untuk tokenisasi dan vektorisasi
+# (referensi per baris; data_cleaning memakai text_normalizer yang hasilnya identik)
 def preprocess_text(text):
     # Mengubah teks menjadi huruf kecil
     text = text.lower()
@@ -548,53 +398,39 @@ def preprocess_text(text):
     return text
 
 # Fungsi untuk membersihkan teks dalam kolom 'tags'
-def clean_tags(text):
-    # Ganti semua pola "\n\t" atau kombinasi "\n" dan "\t" dengan spasi
-    text = re.sub(r"\s+", " ", text)  # Menghapus semua whitespace berlebih
-    text = text.strip()  # Menghapus whitespace di awal dan akhir teks
-    return text   # Mengembalikan text
+def clean_tags(tags):
+    # Ganti semua whitespace berlebih ("\n\t", dll.) dengan satu spasi, lalu hapus spasi di awal dan akhir
+    return tags.str.replace(WHITESPACE_PATTERN, " ", regex=True).str.strip()
 
 # Fungsi untuk membersihkan teks dalam kolom 'property_id'
-def clean_property_id(text):
-    text = text.lower()  # Mengubah teks menjadi huruf kecil
-    text = text.strip()  # Menghapus whitespace di awal dan akhir teks
-    return text  # Mengembalikan text
+def clean_property_id(property_id):
+    return property_id.str.lower().str.strip()    # Huruf kecil dan tanpa whitespace di awal/akhir
 
 # Fungsi untuk mengekstrak harga dari teks dalam format USD ($) atau Rupiah (Rp)
-def extract_price(text):
-  # Mengecek apakah teks mengandung mata uang USD
-  if 'USD' in text or '$' in text:
-    # Mencari angka dalam format USD
-    usd_match = re.search(r'(\d+[\.,]?\d*)', text)
-    if usd_match:
-      # Mengubah angka ke float setelah menghapus tanda koma (,) sebagai pemisah ribuan
-      return float(usd_match.group(1).replace(',', ''))
-
-  # Mengecek apakah teks mengandung mata uang Rupiah (Rp)
-  elif 'Rp' in text:
-    # Mencari angka dalam format Rupiah
-    rp_match = re.search(r'Rp\s*([\d\.]+)', text)
-    if rp_match:
-      # Menghapus titik (.) sebagai pemisah ribuan dan mengonversi ke float
-      rupiah = float(rp_match.group(1).replace('.', ''))
-      # Mengonversi harga dari Rupiah ke USD
-      return np.ceil(rupiah / 16244)
-
-  # Jika tidak ada angka yang cocok, kembalikan NaN
-  return np.nan
-
-# Fungsi untuk mengisi kolom 'area' berdasarkan informasi 'address_detail'
-def fill_area(row):
-    if pd.isna(row['area']):    # Mengecek apakah kolom 'area' bernilai NaN (kosong)
-        # Menentukan nilai 'area' berdasarkan kata kunci dalam 'address_detail'
-        address_detail = str(row['address_detail'])
-        if "Uluwatu" in address_detail:    # Jika mengandung kata "Uluwatu"
-            return "Uluwatu"
-        elif "Yogyakarta" in address_detail:    # Jika mengandung kata "Yogyakarta"
-            return "Yogyakarta"
-        elif "Pecatu" in address_detail:    # Jika mengandung kata "Pecatu"
-            return "Pecatu"
-    return row['area']    # Jika 'area' sudah diisi atau tidak ada kata kunci yang cocok, kembalikan nilai asli
+def extract_price(price):
+    # Teks yang mengandung USD/$ diproses sebagai USD; sisanya yang mengandung Rp sebagai Rupiah
+    is_usd = price.str.contains('USD', regex=False) | price.str.contains('$', regex=False)
+    is_rupiah = ~is_usd & price.str.contains('Rp', regex=False)
+
+    # Angka USD: hapus tanda koma (,) sebagai pemisah ribuan
+    usd = price.str.extract(USD_PRICE_PATTERN, expand=False).str.replace(',', '', regex=False).astype(float)
+    # Angka Rupiah: hapus titik (.) sebagai pemisah ribuan lalu konversi ke USD
+    rupiah = price.str.extract(RUPIAH_PRICE_PATTERN, expand=False).str.replace('.', '', regex=False).astype(float)
+
+    # Jika tidak ada angka yang cocok, hasilnya NaN
+    return pd.Series(np.select([is_usd, is_rupiah], [usd, np.ceil(rupiah / RUPIAH_PER_USD)], default=np.nan), index=price.index)
+
+# Fungsi untuk mengisi kolom 'area' yang kosong berdasarkan kata kunci pada 'address_detail' (peka huruf besar/kecil)
+def fill_area(area, address_detail):
+    address_detail = address_detail.astype(str).astype('category')
+    missing = area.isna()    # Hanya 'area' yang kosong (NaN) yang diisi
+    conditions = [
+        missing & address_detail.str.contains("Uluwatu", regex=False),
+        missing & address_detail.str.contains("Yogyakarta", regex=False),
+        missing & address_detail.str.contains("Pecatu", regex=False),
+    ]
+    return pd.Series(np.select(conditions, ["Uluwatu", "Yogyakarta", "Pecatu"], default=area.to_numpy(dtype=object)),
+                     index=area.index)
 
 # Fungsi untuk cleaning data
 def data_cleaning(bukit_vista_property):
@@ -606,9 +442,8 @@ def data_cleaning(bukit_vista_property):
   bukit_vista_property['property_id'] = bukit_vista_property['property_id'].fillna('0')
 
   # Merubah isi kolom yang hanya mengandung 'View' menjadi 'Villa' untuk mengelompokkan hasil scraping images
-  bukit_vista_property['property_type'] = bukit_vista_property['property_type'].apply(
-    lambda x: 'Villa' if isinstance(x, str) and 'View' in x else x
-  )
+  contains_view = bukit_vista_property['property_type'].str.contains('View', regex=False, na=False)
+  bukit_vista_property['property_type'] = bukit_vista_property['property_type'].mask(contains_view, 'Villa')
 
   # Mengisi nilai yang hilang (NaN) pada kolom 'address_detail' dengan 'Uluwatu, Bali'
   bukit_vista_property['address_detail'] = bukit_vista_property['address_detail'].fillna('Uluwatu, Bali')
@@ -623,17 +458,17 @@ def data_cleaning(bukit_vista_property):
   # Mengganti nilai kosong ('') pada kolom 'tags' dengan NaN untuk mempermudah identifikasi nilai kosong
   bukit_vista_property['tags'] = bukit_vista_property['tags'].replace('', np.nan)
 
-  # Terapkan fungsi ke DataFrame kolom 'tags'
-  bukit_vista_property['tags'] = bukit_vista_property.apply(fill_tags, axis=1)
+  # Isi 'tags' yang kosong berdasarkan 'address_detail'
+  bukit_vista_property['tags'] = fill_tags(bukit_vista_property['tags'], bukit_vista_property['address_detail'])
 
   # Menambahkan kolom baru 'class' untuk mengelompokkan hasil scraping images
-  bukit_vista_property['class'] = bukit_vista_property['property_type'].apply(extract_class_property)
+  bukit_vista_property['class'] = extract_class_property(bukit_vista_property['property_type'])
 
   # Mengganti nilai kosong ('') pada kolom 'area' dengan NaN untuk mempermudah identifikasi nilai kosong
   bukit_vista_property['area'] = bukit_vista_property['area'].replace('', np.nan)
 
-  # Terapkan fungsi untuk mengisi area
-  bukit_vista_property['area'] = bukit_vista_property.apply(fill_area, axis=1)
+  # Isi 'area' yang kosong berdasarkan 'address_detail'
+  bukit_vista_property['area'] = fill_area(bukit_vista_property['area'], bukit_vista_property['address_detail'])
 
   # Ubah kolom 'area' ke string setelah pengisian selesai
   bukit_vista_property['area'] = bukit_vista_property['area'].astype(str)
@@ -641,35 +476,35 @@ def data_cleaning(bukit_vista_property):
   # Copy DataFrame sebelum data cleaning, tokenisasi dan vektorisasi
   bukit_vista_df = bukit_vista_property.copy()
 
-  # Terapkan fungsi preprocess_text pada kolom title
-  bukit_vista_df['cleaned_title'] = bukit_vista_df['title'].apply(preprocess_text)
+  # Normalisasi teks (setara preprocess_text) pada kolom title
+  bukit_vista_df['cleaned_title'] = text_normalizer.normalize_many(bukit_vista_df['title'])
 
-  # Terapkan fungsi preprocess_text pada kolom property_type
-  bukit_vista_df['cleaned_property_type'] = bukit_vista_df['property_type'].apply(preprocess_text)
+  # Normalisasi teks (setara preprocess_text) pada kolom property_type
+  bukit_vista_df['cleaned_property_type'] = text_normalizer.normalize_many(bukit_vista_df['property_type'])
 
-  # Terapkan fungsi preprocess_text pada kolom address_detail
-  bukit_vista_df['address_detail'] = bukit_vista_df['address_detail'].apply(preprocess_text)
+  # Normalisasi teks (setara preprocess_text) pada kolom address_detail
+  bukit_vista_df['address_detail'] = text_normalizer.normalize_many(bukit_vista_df['address_detail'])
 
-  # Terapkan fungsi clean_tags pada kolom tags
-  bukit_vista_df['tags'] = bukit_vista_df['tags'].apply(clean_tags)
+  # Bersihkan whitespace pada kolom tags
+  bukit_vista_df['tags'] = clean_tags(bukit_vista_df['tags'])
 
-  # Terapkan fungsi preprocess_text pada kolom tags
-  bukit_vista_df['tags'] = bukit_vista_df['tags'].apply(preprocess_text)
+  # Normalisasi teks (setara preprocess_text) pada kolom tags
+  bukit_vista_df['tags'] = text_normalizer.normalize_many(bukit_vista_df['tags'])
 
-  # Terapkan fungsi preprocess_text pada kolom area
-  bukit_vista_df['cleaned_area'] = bukit_vista_df['area'].apply(preprocess_text)
+  # Normalisasi teks (setara preprocess_text) pada kolom area
+  bukit_vista_df['cleaned_area'] = text_normalizer.normalize_many(bukit_vista_df['area'])
 
-  # Terapkan fungsi clean_property_id pada kolom property_id
-  bukit_vista_df['property_id'] = bukit_vista_df['property_id'].apply(clean_property_id)
+  # Bersihkan kolom property_id
+  bukit_vista_df['property_id'] = clean_property_id(bukit_vista_df['property_id'])
 
   # Mengganti simbol '/' dengan ' per ' dalam kolom 'price'
   bukit_vista_df['price'] = bukit_vista_df['price'].str.replace("/", " per ")
 
-  # Menerapkan fungsi extract_price untuk mengekstrak harga dalam bentuk angka
-  bukit_vista_df['price_in_usd'] = bukit_vista_df['price'].apply(lambda x: extract_price(x)).astype(str)
+  # Mengekstrak harga dalam bentuk angka (USD)
+  bukit_vista_df['price_in_usd'] = extract_price(bukit_vista_df['price']).astype(str)
 
   # Mengekstrak periode sewa dari teks, yaitu kata setelah "per"
-  bukit_vista_df['rental_period'] = bukit_vista_df['price'].str.extract(r'per (.+)$')
+  bukit_vista_df['rental_period'] = bukit_vista_df['price'].str.extract(RENTAL_PERIOD_PATTERN, expand=False)
 
   # Jika tidak ditemukan periode sewa (NaN), maka diisi dengan nilai default 'night'
   bukit_vista_df['rental_period'] = bukit_vista_df['rental_period'].fillna('night')
@@ -683,136 +518,312 @@ def data_cleaning(bukit_vista_property):
   # Mengembalikan bukit_vista_df
   return bukit_vista_df
 
-# Menerapkan fungsi data_cleaning
-bukit_vista_df = data_cleaning(bukit_vista_property)
+# Mode incremental: baris yang input mentahnya sama dengan artefak sebelumnya tidak dibersihkan ulang
+INCREMENTAL = True
+CLEANING_VERSION = 1    # Naikkan jika data_cleaning/normalisasi teks berubah agar semua baris dibersihkan ulang
+ARTIFACT_DIR = "."    # Folder tempat semua artefak (Parquet, matriks fitur, model TF-IDF) dibaca dan disimpan
+ARTIFACT_FILE_PATTERN = re.compile(r"data_bukit_vista_(\d{2}-\d{2}-\d{4})\.parquet")
+
+# Fungsi untuk memuat artefak Parquet terbaru dari run sebelumnya (None jika belum ada)
+def load_previous_artifact(directory):
+    latest_name, latest_date = None, None
+    for name in os.listdir(directory):
+        match = ARTIFACT_FILE_PATTERN.fullmatch(name)
+        if match:
+            file_date = datetime.strptime(match.group(1), "%d-%m-%Y")
+            if latest_date is None or file_date > latest_date:
+                latest_name, latest_date = name, file_date
+    if latest_name is None:
+        return None
+    print(f"Artefak sebelumnya: {latest_name}")
+    return pd.read_parquet(os.path.join(directory, latest_name))
+
+# Fungsi untuk menghitung sidik jari tiap baris mentah (link, isi halaman, gambar, dll.) sebelum cleaning;
+# CLEANING_VERSION ikut di-hash agar hasil cleaning versi lama tidak dipakai ulang
+def row_fingerprints(df):
+    fingerprints = []
+    for record in df.to_dict('records'):
+        values = {key: str(value) for key, value in record.items() if not pd.isna(value)}    # Kolom kosong diabaikan
+        payload = json.dumps([CLEANING_VERSION, values], sort_keys=True)
+        fingerprints.append(hashlib.sha256(payload.encode()).hexdigest())
+    return fingerprints
+
+# Fungsi untuk cleaning incremental: hanya baris baru/berubah yang dibersihkan, sisanya diambil dari artefak sebelumnya
+def incremental_cleaning(bukit_vista_property, previous_df):
+    bukit_vista_property = bukit_vista_property.reset_index(drop=True)
+    bukit_vista_property['row_hash'] = row_fingerprints(bukit_vista_property)
+
+    # Tanpa artefak sebelumnya (atau artefak lama tanpa row_hash) semua baris dibersihkan
+    if previous_df is None or 'row_hash' not in previous_df.columns:
+        return data_cleaning(bukit_vista_property)
+
+    # Kolom sequence dihitung ulang oleh tokenizer untuk seluruh data
+    previous_df = previous_df.drop(columns=[col for col in previous_df.columns if col.endswith('_sequences')])
+    previous_df = previous_df.drop_duplicates('row_hash').set_index('row_hash', drop=False)
+
+    reused = bukit_vista_property['row_hash'].isin(previous_df.index)
+    carried = previous_df.loc[bukit_vista_property.loc[reused, 'row_hash']]    # Baris lama yang tidak berubah
+    carried.index = bukit_vista_property.index[reused]
+
+    parts = [carried]
+    if (~reused).any():
+        parts.append(data_cleaning(bukit_vista_property[~reused].copy()))    # Hanya baris baru/berubah
+
+    # Listing yang sudah hilang tidak ikut terbawa karena hanya baris yang masih ada yang dicocokkan
+    dropped = (~previous_df['property_links'].isin(bukit_vista_property['property_links'])).sum()
+    print(f"Baris dipakai ulang: {reused.sum()}, dibersihkan ulang: {(~reused).sum()}, listing hilang: {dropped}")
+
+    # Kembalikan dengan urutan baris hasil scraping saat ini
+    return pd.concat(parts).sort_index()
+
 
 """11. Vectorizer"""
 
-# Mendefinisikan fungsi vectorizer
-def vectorizer(bukit_vista_df):
-  # Inisialisasi TF-IDF Vectorizer
-  title_vectorizer = TfidfVectorizer(min_df=5,
-                              max_df=0.8,
-                              sublinear_tf=True,
-                              use_idf=True)
-
-  property_type_vectorizer = TfidfVectorizer(min_df=5,
-                              max_df=0.8,
-                              sublinear_tf=True,
-                              use_idf=True)
-
-  tags_vectorizer = TfidfVectorizer(min_df=5,
-                              max_df=0.8,
-                              sublinear_tf=True,
-                              use_idf=True)
-
-  address_detail_vectorizer = TfidfVectorizer(min_df=5,
-                              max_df=0.8,
-                              sublinear_tf=True,
-                              use_idf=True)
-
-  area_vectorizer = TfidfVectorizer(min_df=5,
-                              max_df=0.8,
-                              sublinear_tf=True,
-                              use_idf=True)
-
-  # Vektorisasi teks pada kolom 'title' menggunakan TF-IDF
-  title_tfidf_matrix = title_vectorizer.fit_transform(bukit_vista_df['cleaned_title'])
-
-  # Vektorisasi teks pada kolom 'property_type' menggunakan TF-IDF
-  property_type_tfidf_matrix = property_type_vectorizer.fit_transform(bukit_vista_df['cleaned_property_type'])
-
-  # Vektorisasi teks pada kolom 'tags' menggunakan TF-IDF
-  tags_tfidf_matrix = tags_vectorizer.fit_transform(bukit_vista_df['tags'])
-
-  # Vektorisasi teks pada kolom 'address_detail' menggunakan TF-IDF
-  address_detail_tfidf_matrix = address_detail_vectorizer.fit_transform(bukit_vista_df['address_detail'])
-
-  # Vektorisasi teks pada kolom 'area' menggunakan TF-IDF
-  area_tfidf_matrix = area_vectorizer.fit_transform(bukit_vista_df['cleaned_area'])
-
-  # Mengonversi hasil TF-IDF dari bentuk matriks sparse ke dalam list, lalu menyimpannya di dataframe
-  bukit_vista_df['title_vectorizer'] = title_tfidf_matrix.toarray().tolist()
-  bukit_vista_df['property_type_vectorizer'] = property_type_tfidf_matrix.toarray().tolist()
-  bukit_vista_df['tags_vectorizer'] = tags_tfidf_matrix.toarray().tolist()
-  bukit_vista_df['address_detail_vectorizer'] = address_detail_tfidf_matrix.toarray().tolist()
-  bukit_vista_df['area_vectorizer'] = area_tfidf_matrix.toarray().tolist()
+# Kolom teks yang divektorisasi oleh setiap TF-IDF vectorizer
+VECTORIZER_TEXT_COLUMNS = {
+    'title_vectorizer': 'cleaned_title',
+    'property_type_vectorizer': 'cleaned_property_type',
+    'tags_vectorizer': 'tags',
+    'address_detail_vectorizer': 'address_detail',
+    'area_vectorizer': 'cleaned_area',
+}
 
-  # Mengembalikan bukit_vista_df
-  return bukit_vista_df
+# Set True (atau jalankan dengan --refit) untuk fit ulang vectorizer, mis. jika vocabulary sudah banyak tertinggal
+REFIT_VECTORIZERS = False
 
-# Menerapkan fungsi
-bukit_vista_df = vectorizer(bukit_vista_df)
+# Fungsi untuk membuat TF-IDF Vectorizer baru
+def new_tfidf_vectorizer():
+  return TfidfVectorizer(min_df=5,
+                         max_df=0.8,
+                         sublinear_tf=True,
+                         use_idf=True)
+
+# Mendefinisikan fungsi vectorizer
+# vectorizers=None: fit vectorizer baru; selain itu hanya transform dengan vectorizer yang sudah di-fit
+def vectorizer(bukit_vista_df, vectorizers=None):
+  fit = vectorizers is None
+  if fit:
+    vectorizers = {name: new_tfidf_vectorizer() for name in VECTORIZER_TEXT_COLUMNS}
+
+  # Hasil TF-IDF tetap disimpan dalam bentuk matriks sparse (CSR), tidak diubah menjadi list dense
+  tfidf_matrices = {}
+  for name, column in VECTORIZER_TEXT_COLUMNS.items():
+    texts = bukit_vista_df[column].tolist()    # Teks kolom dibaca sekali untuk TF-IDF dan sequence
+    if fit:
+      tfidf_matrices[name] = vectorizers[name].fit_transform(texts).tocsr()
+    else:
+      tfidf_matrices[name] = vectorizers[name].transform(texts).tocsr()
+
+    # Sequence kolom yang sama dibuat pada pass yang sama (lihat tokenizer)
+    bukit_vista_df[f"{name.removesuffix('_vectorizer')}_sequences"] = SequenceEncoder().fit_transform(texts)
+
+  # Mengembalikan bukit_vista_df, matriks TF-IDF dan vectorizer yang dipakai
+  return bukit_vista_df, tfidf_matrices, vectorizers
+
+# Kolom fitur yang digabungkan oleh aplikasi rekomendasi (urutan harus sama dengan recommendation_system.py)
+feature_columns = ['title_vectorizer', 'property_type_vectorizer', 'tags_vectorizer', 'area_vectorizer']
 
 """12. Tokenizer"""
 
+# Kolom sequence: nama sequence -> kolom teks sumber
+SEQUENCE_TEXT_COLUMNS = {
+    'title': 'cleaned_title',
+    'property_type': 'cleaned_property_type',
+    'tags': 'tags',
+    'address_detail': 'address_detail',
+    'price': 'price_in_usd',
+    'property_id': 'property_id',
+    'area': 'cleaned_area',
+}
+
 # Mendefinisikan fungsi tokenizer
 def tokenizer(bukit_vista_df):
-  # Inisialisasi tokenizer
-  tokenizer_title = Tokenizer()
-  tokenizer_property_type = Tokenizer()
-  tokenizer_tags = Tokenizer()
-  tokenizer_address_detail = Tokenizer()
-  tokenizer_price = Tokenizer()
-  tokenizer_property_id = Tokenizer()
-  tokenizer_area = Tokenizer()
-
-  # Membuat tokenizer untuk kolom 'title'
-  title_tokenizer = tokenizer_title.fit_on_texts(bukit_vista_df['cleaned_title'])
-
-  # Mengonversi teks dalam kolom 'title' menjadi urutan angka (sequences)
-  bukit_vista_df['title_sequences'] = tokenizer_title.texts_to_sequences(bukit_vista_df['cleaned_title'])
-
-  # Membuat tokenizer untuk kolom 'property_type'
-  property_type_tokenizer = tokenizer_property_type.fit_on_texts(bukit_vista_df['cleaned_property_type'])
-
-  # Mengonversi teks dalam kolom 'property_type' menjadi urutan angka (sequences)
-  bukit_vista_df['property_type_sequences'] = tokenizer_property_type.texts_to_sequences(bukit_vista_df['cleaned_property_type'])
-
-  # Membuat tokenizer untuk kolom 'tags'
-  tags_tokenizer = tokenizer_tags.fit_on_texts(bukit_vista_df['tags'])
-
-  # Mengonversi teks dalam kolom 'tags' menjadi urutan angka (sequences)
-  bukit_vista_df['tags_sequences'] = tokenizer_tags.texts_to_sequences(bukit_vista_df['tags'])
-
-  # Membuat tokenizer untuk kolom 'address_detail'
-  address_detail_tokenizer = tokenizer_address_detail.fit_on_texts(bukit_vista_df['address_detail'])
+  # Mengonversi teks setiap kolom menjadi urutan angka (sequences) dengan encoder word-index
+  for name, column in SEQUENCE_TEXT_COLUMNS.items():
+    if f'{name}_sequences' in bukit_vista_df.columns:    # Sudah dibuat bersama TF-IDF di vectorizer
+      continue
+    bukit_vista_df[f'{name}_sequences'] = SequenceEncoder().fit_transform(bukit_vista_df[column])
 
-  # Mengonversi teks dalam kolom 'address_detail' menjadi urutan angka (sequences)
-  bukit_vista_df['address_detail_sequences'] = tokenizer_address_detail.texts_to_sequences(bukit_vista_df['address_detail'])
-
-  # Membuat tokenizer untuk kolom 'price'
-  price_tokenizer = tokenizer_price.fit_on_texts(bukit_vista_df['price_in_usd'])
-
-  # Mengonversi teks dalam kolom 'price' menjadi urutan angka (sequences)
-  bukit_vista_df['price_sequences'] = tokenizer_price.texts_to_sequences(bukit_vista_df['price_in_usd'])
-
-  # Membuat tokenizer untuk kolom 'property_id'
-  property_id_tokenizer = tokenizer_property_id.fit_on_texts(bukit_vista_df['property_id'])
-
-  # Mengonversi teks dalam kolom 'property_id' menjadi urutan angka (sequences)
-  bukit_vista_df['property_id_sequences'] = tokenizer_property_id.texts_to_sequences(bukit_vista_df['property_id'])
+  # Mengembalikan bukit_vista_df
+  return bukit_vista_df
 
-  # Membuat tokenizer untuk kolom 'area'
-  area_tokenizer = tokenizer_area.fit_on_texts(bukit_vista_df['cleaned_area'])
+"""13. Download Dataset"""
 
-  # Mengonversi teks dalam kolom 'area' menjadi urutan angka (sequences)
-  bukit_vista_df['area_sequences'] = tokenizer_area.texts_to_sequences(bukit_vista_df['cleaned_area'])
+# Versi format artefak (harus sama dengan ARTIFACT_VERSION di recommender/artifact.py)
+ARTIFACT_VERSION = 2
+FEATURE_PARTS = ("data", "indices", "indptr")    # Komponen CSR matriks fitur, masing-masing satu file .npy
+ARTIFACT_METADATA_KEY = b"bukit_vista_artifact"
+
+# Set True untuk tetap membuat file Excel sebagai ekspor tambahan (opsional)
+EXPORT_EXCEL = False
+
+# Fungsi untuk menyimpan DataFrame sebagai Parquet beserta manifest artefak di metadata skema
+def save_parquet(df, filename, manifest):
+    table = pa.Table.from_pandas(df, preserve_index=False)    # Ubah DataFrame menjadi tabel Arrow
+    metadata = dict(table.schema.metadata or {})    # Pertahankan metadata pandas
+    metadata[ARTIFACT_METADATA_KEY] = json.dumps(manifest).encode()    # Tambahkan manifest artefak
+    pq.write_table(table.replace_schema_metadata(metadata), filename)    # Tulis file Parquet
+
+# Fungsi untuk menyimpan artefak: metadata properti (Parquet) dan matriks fitur sparse float32 (komponen CSR .npy)
+def save_artifact(bukit_vista_df, combined_features, tfidf_matrices, feature_columns, timestamp, model_version=None,
+                  directory=None):
+    directory = directory or ARTIFACT_DIR    # Folder yang sama dengan yang dibaca load_previous_artifact
+    data_filename = f"data_bukit_vista_{timestamp}.parquet"
+    features_filenames = {part: f"features_bukit_vista_{timestamp}.{part}.npy" for part in FEATURE_PARTS}
+
+    # Matriks fitur tetap sparse: data/indices/indptr CSR disimpan terpisah agar bisa dibaca zero-copy dengan np.load(mmap_mode='r')
+    features = sparse.csr_matrix(combined_features, dtype=np.float32)
+    for part, filename in features_filenames.items():
+        np.save(os.path.join(directory, filename), getattr(features, part))
+
+    # Manifest menjelaskan versi format, file dan tata letak kolom matriks fitur
+    manifest = {
+        "artifact_version": ARTIFACT_VERSION,
+        "features_files": features_filenames,
+        "features_shape": [int(n) for n in features.shape],
+        "n_rows": int(features.shape[0]),
+        "feature_columns": feature_columns,
+        "feature_dims": [int(tfidf_matrices[col].shape[1]) for col in feature_columns],
+        "dtype": "float32",
+        "model_version": model_version,    # Versi model TF-IDF yang menghasilkan fitur
+    }
+    save_parquet(bukit_vista_df, os.path.join(directory, data_filename), manifest)
 
-  # Mengembalikan bukit_vista_df
-  return bukit_vista_df
+    # Mengembalikan path file yang dibuat (manifest hanya mencatat nama file, relatif terhadap folder artefak)
+    return os.path.join(directory, data_filename), [os.path.join(directory, name) for name in features_filenames.values()]
 
-# Menerapkan fungsi
-bukit_vista_df = tokenizer(bukit_vista_df)
+"""14. Pipeline"""
 
-"""13. Download Dataset"""
+# Tahap discover: kumpulkan link semua halaman properti
+def stage_discover(inputs):
+    return {'url_df': scrape_property_links(bukit_vista_url)}
 
-# Generate timestamp dengan format hari-bulan-tahun
-timestamp = datetime.now().strftime("%d-%m-%Y")
+# Tahap listing: judul, gambar dan data Uluwatu dari halaman listing (tidak bergantung pada tahap lain)
+def stage_listing(inputs):
+    return {
+        'images_title_df': scrape_location_properties(locations),
+        'uluwatu_property': scrape_uluwatu_property(),
+    }
 
-# Simpan file dengan nama yang mengandung timestamp
-bukit_vista_filename = f"data_bukit_vista_{timestamp}.xlsx"
-property_description_filename = f"property_description_{timestamp}.xlsx"
+# Tahap fetch: download setiap halaman properti (isi halaman disimpan di cache respons)
+def stage_fetch(inputs):
+    return {'pages': fetch_property_pages(inputs['url_df'])}
+
+# Tahap extract: jalankan semua extractor pada halaman hasil fetch
+def stage_extract(inputs):
+    pages = inputs['pages']
+    property_data, detail_properties, property_description, property_address_details = split_property_records(
+        extract_property_records(pages), pages['property_links'].map(property_key))
+    return {
+        'property_data': property_data,
+        'detail_properties': detail_properties,
+        'property_description': property_description,
+        'property_address_details': property_address_details,
+    }
 
-bukit_vista_df.to_excel(bukit_vista_filename, index=False)
-property_description.to_excel(property_description_filename, index=False)
\ No newline at end of file
+# Tahap merge: gabungkan semua DataFrame properti
+def stage_merge(inputs):
+    bukit_vista_property = process_bukit_vista_data(inputs['url_df'], inputs['property_data'], inputs['detail_properties'],
+                                                    inputs['property_address_details'], inputs['uluwatu_property'],
+                                                    inputs['images_title_df'])
+    property_description = add_title_to_description(inputs['property_description'], bukit_vista_property)
+    return {'bukit_vista_property': bukit_vista_property, 'property_description': property_description}
+
+# Tahap clean: data cleaning dan preprocessing teks (incremental jika artefak sebelumnya tersedia)
+def stage_clean(inputs):
+    prepare_nltk()
+    bukit_vista_property = inputs['bukit_vista_property'].copy()
+    if INCREMENTAL:
+        bukit_vista_df = incremental_cleaning(bukit_vista_property, load_previous_artifact(ARTIFACT_DIR))
+    else:
+        bukit_vista_df = data_cleaning(bukit_vista_property)
+    return {'bukit_vista_df': bukit_vista_df}
+
+# Tahap vectorise: TF-IDF, matriks fitur gabungan dan tokenisasi
+def stage_vectorise(inputs):
+    bukit_vista_df = inputs['bukit_vista_df'].copy()
+
+    # Pakai model TF-IDF tersimpan (transform saja) agar arti kolom fitur tetap sama; fit baru jika belum ada atau diminta
+    tfidf_model = None if REFIT_VECTORIZERS else load_latest_tfidf_model(ARTIFACT_DIR)
+    if tfidf_model is None:
+        bukit_vista_df, tfidf_matrices, vectorizers = vectorizer(bukit_vista_df)
+        tfidf_model = new_tfidf_model(vectorizers, latest_tfidf_model_version(ARTIFACT_DIR) + 1, len(bukit_vista_df))
+        print(f"Model TF-IDF baru v{tfidf_model['model_version']}: {tfidf_model['vocabulary_sizes']}")
+    else:
+        bukit_vista_df, tfidf_matrices, vectorizers = vectorizer(bukit_vista_df, tfidf_model['vectorizers'])
+        # Proporsi token yang dikenal vocabulary; jika terus turun, saatnya fit ulang (--refit)
+        for name, column in VECTORIZER_TEXT_COLUMNS.items():
+            coverage = vocabulary_coverage(vectorizers[name], bukit_vista_df[column])
+            print(f"Model TF-IDF v{tfidf_model['model_version']} {name}: {coverage:.1%} token dikenal")
+
+    # Menggabungkan matriks TF-IDF menjadi satu matriks fitur CSR
+    combined_features = sparse.hstack([tfidf_matrices[col] for col in feature_columns], format='csr')
+
+    bukit_vista_df = tokenizer(bukit_vista_df)
+    return {'bukit_vista_df': bukit_vista_df, 'tfidf_matrices': tfidf_matrices, 'combined_features': combined_features,
+            'tfidf_model': tfidf_model}
+
+# Tahap export: tulis artefak Parquet + matriks fitur (dan Excel jika diminta)
+def stage_export(inputs):
+    # Generate timestamp dengan format hari-bulan-tahun
+    timestamp = datetime.now().strftime("%d-%m-%Y")
+    bukit_vista_df = inputs['bukit_vista_df']
+    property_description = inputs['property_description']
+
+    # Simpan file dengan nama yang mengandung timestamp
+    tfidf_model = inputs['tfidf_model']
+    data_filename, features_filenames = save_artifact(bukit_vista_df, inputs['combined_features'], inputs['tfidf_matrices'],
+                                                      feature_columns, timestamp, tfidf_model['model_version'], ARTIFACT_DIR)
+    property_description.to_parquet(os.path.join(ARTIFACT_DIR, f"property_description_{timestamp}.parquet"), index=False)
+
+    # Ekspor Excel hanya jika diminta
+    if EXPORT_EXCEL:
+        bukit_vista_df.to_excel(os.path.join(ARTIFACT_DIR, f"data_bukit_vista_{timestamp}.xlsx"), index=False)
+        property_description.to_excel(os.path.join(ARTIFACT_DIR, f"property_description_{timestamp}.xlsx"), index=False)
+
+    # Model TF-IDF baru disimpan bersama artefak yang dihasilkannya (model lama tidak ditimpa)
+    files = [data_filename, *features_filenames]
+    if tfidf_model['model_version'] > latest_tfidf_model_version(ARTIFACT_DIR):
+        files.append(save_tfidf_model(tfidf_model, ARTIFACT_DIR))
+    return {'files': files}
+
+# Daftar tahap sesuai urutan; tahap yang dependensinya sudah siap berjalan paralel
+STAGES = [
+    Stage('discover', stage_discover),
+    Stage('listing', stage_listing),
+    Stage('fetch', stage_fetch, requires=['discover']),
+    Stage('extract', stage_extract, requires=['fetch']),
+    Stage('merge', stage_merge, requires=['discover', 'extract', 'listing']),
+    Stage('clean', stage_clean, requires=['merge']),
+    Stage('vectorise', stage_vectorise, requires=['clean']),
+    Stage('export', stage_export, requires=['vectorise', 'merge']),
+]
+CHECKPOINT_DIR = "checkpoints"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scraping dan pembuatan artefak data Bukit Vista.")
+    stage_names = [stage.name for stage in STAGES]
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--from-stage", choices=stage_names, help="Lanjutkan dari tahap ini (tahap sebelumnya dari checkpoint).")
+    group.add_argument("--only-stage", choices=stage_names, help="Jalankan satu tahap saja (input dari checkpoint).")
+    parser.add_argument("--checkpoint-dir", default=CHECKPOINT_DIR, help="Folder checkpoint tiap tahap.")
+    parser.add_argument("--refit", action="store_true", help="Fit ulang TF-IDF dan simpan sebagai versi model baru.")
+    args = parser.parse_args(argv)
+
+    global REFIT_VECTORIZERS
+    REFIT_VECTORIZERS = REFIT_VECTORIZERS or args.refit
+
+    open_fetcher()
+    pipeline = Pipeline(STAGES, args.checkpoint_dir)
+    try:
+        pipeline.run(from_stage=args.from_stage, only_stage=args.only_stage)
+    finally:
+        fetcher.close()
+        response_cache.close()
+
+    # Ringkasan durasi tiap tahap
+    for name, seconds in pipeline.timings.items():
+        print(f"{name:<10} {seconds:8.1f} s")
+
+if __name__ == "__main__":
+    main()
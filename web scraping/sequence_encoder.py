@@ -0,0 +1,50 @@
+"""Encoder word-index sequence tanpa TensorFlow.
+
+``SequenceEncoder`` meniru ``tf.keras.preprocessing.text.Tokenizer`` dengan
+pengaturan default (filter tanda baca yang sama, lowercase, split spasi,
+tanpa ``num_words`` / ``oov_token``): indeks kata diurutkan berdasarkan
+frekuensi menurun, kata dengan frekuensi sama mengikuti urutan kemunculan
+pertama, dan indeks dimulai dari 1. Kata yang tidak dikenal dilewati.
+"""
+
+# Filter default Keras Tokenizer
+KERAS_FILTERS = '!"#$%&()*+,-./:;<=>?@[\\]^_`{|}~\t\n'
+
+
+class SequenceEncoder:
+    """Pengganti Keras ``Tokenizer`` untuk ``fit_on_texts`` / ``texts_to_sequences``."""
+
+    def __init__(self, filters=KERAS_FILTERS, lower=True, split=' '):
+        self.lower = lower
+        self.split = split
+        self.translate_table = str.maketrans({char: split for char in filters})
+        self.word_counts = {}    # Kata -> jumlah kemunculan (urutan kemunculan pertama dipertahankan)
+        self.word_index = {}    # Kata -> indeks (mulai dari 1)
+
+    def text_to_word_sequence(self, text):
+        if self.lower:
+            text = text.lower()
+        return [word for word in text.translate(self.translate_table).split(self.split) if word]
+
+    def fit_on_texts(self, texts):
+        # Hitung frekuensi kata lalu susun ulang indeks (bisa dipanggil berkali-kali seperti Keras)
+        for text in texts:
+            for word in self.text_to_word_sequence(text):
+                self.word_counts[word] = self.word_counts.get(word, 0) + 1
+        ordered = sorted(self.word_counts, key=self.word_counts.get, reverse=True)    # sorted stabil: urutan awal untuk frekuensi sama
+        self.word_index = {word: index for index, word in enumerate(ordered, start=1)}
+
+    def texts_to_sequences(self, texts):
+        # Teks yang sama hanya di-encode sekali
+        encoded = {}
+        sequences = []
+        for text in texts:
+            if text not in encoded:
+                encoded[text] = [self.word_index[word] for word in self.text_to_word_sequence(text) if word in self.word_index]
+            sequences.append(list(encoded[text]))
+        return sequences
+
+    def fit_transform(self, texts):
+        texts = list(texts)
+        self.fit_on_texts(texts)
+        return self.texts_to_sequences(texts)
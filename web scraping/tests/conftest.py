@@ -0,0 +1,5 @@
+"""Modul scraper ada di folder ``web scraping/`` (bukan package), jadi folder itu ditambahkan ke sys.path."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
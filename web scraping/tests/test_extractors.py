@@ -0,0 +1,38 @@
+"""Extractor halaman detail: parse sebagian (SoupStrainer) harus sama dengan parse seluruh dokumen."""
+import glob
+import os
+
+import pytest
+
+from extractors import ADDRESS_FIELDS, extract_property_page
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+FIXTURE_PAGES = sorted(glob.glob(os.path.join(FIXTURE_DIR, "property_*.html")))
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("path", FIXTURE_PAGES, ids=os.path.basename)
+def test_scoped_parse_matches_full_parse(path):
+    with open(path, encoding="utf-8") as f:
+        html = f.read()
+    reference = extract_property_page(html, parser="html.parser", scoped=False)    # Extractor lama
+    assert extract_property_page(html, scoped=False) == reference
+    assert extract_property_page(html, scoped=True) == reference
+
+
+def test_multi_class_blocks_are_kept():
+    # Blok alamat/detail dengan lebih dari satu class (mis. "block-content-wrap clearfix") tidak boleh terbuang
+    record = extract_property_page(read_fixture("property_yogyakarta_guest_house.html"))
+    assert record["address"]["area"] == "Sleman"
+    assert record["address"]["city"] == "Yogyakarta"
+    assert record["details"]["property_id"] == "BV2207"
+
+
+def test_page_without_address_block():
+    record = extract_property_page(read_fixture("property_nusa_penida_no_address.html"))
+    assert record["address"] == dict.fromkeys(ADDRESS_FIELDS)
+    assert record["combined"]["title"] == "Cliffside Bungalow Nusa Penida"
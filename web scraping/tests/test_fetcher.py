@@ -0,0 +1,96 @@
+"""Fetcher terhadap server HTTP lokal: retry + backoff, rate limit per host dan koneksi yang dipakai ulang."""
+import collections
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from fetcher import Fetcher
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """``/fail/<status>/<n>/...`` membalas ``status`` untuk n request pertama lalu 200; path lain langsung 200."""
+
+    protocol_version = "HTTP/1.1"    # Keep-alive agar session bisa memakai ulang koneksi
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.hits[self.path] += 1
+            server.requests.append((time.monotonic(), self.path, self.client_address[1]))
+            hits = server.hits[self.path]
+
+        status = 200
+        parts = self.path.strip("/").split("/")
+        if parts[0] == "fail" and hits <= int(parts[2]):
+            status = int(parts[1])
+        body = f"{status} {self.path}".encode()
+        self.send_response(status)
+        if status == 429:
+            self.send_header("Retry-After", "0")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass    # Tanpa log request di output test
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.lock = threading.Lock()
+    server.hits = collections.Counter()
+    server.requests = []    # (waktu, path, port klien) per request
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_retries_429_and_500_then_succeeds(server):
+    fetcher = Fetcher(retries=3, backoff=0.01, requests_per_second=None)
+    assert fetcher.fetch(f"{server.url}/fail/429/2/a").text == "200 /fail/429/2/a"
+    assert fetcher.fetch(f"{server.url}/fail/500/1/b").text == "200 /fail/500/1/b"
+    assert server.hits["/fail/429/2/a"] == 3
+    assert server.hits["/fail/500/1/b"] == 2
+
+
+def test_gives_up_after_retries(server):
+    fetcher = Fetcher(retries=2, backoff=0.01, requests_per_second=None)
+    with pytest.raises(requests.HTTPError):
+        fetcher.fetch(f"{server.url}/fail/503/99/c")
+    assert server.hits["/fail/503/99/c"] == 3    # Satu request awal + dua retry
+
+    # Di fetch_all error dikembalikan per URL, URL lain tetap berhasil
+    results = fetcher.fetch_all([f"{server.url}/fail/503/99/d", f"{server.url}/ok"])
+    assert isinstance(results[0], requests.HTTPError)
+    assert results[1].text == "200 /ok"
+
+
+def test_backoff_waits_between_retries(server):
+    fetcher = Fetcher(retries=2, backoff=0.1, requests_per_second=None)
+    fetcher.fetch(f"{server.url}/fail/500/2/e")
+    times = [t for t, path, _ in server.requests]
+    # Jitter: jeda retry ke-n minimal setengah dari backoff * 2**n
+    assert times[1] - times[0] >= 0.05
+    assert times[2] - times[1] >= 0.1
+
+
+def test_rate_limit_per_host(server):
+    fetcher = Fetcher(max_workers=4, requests_per_second=20)
+    fetcher.fetch_all([f"{server.url}/ok/{i}" for i in range(6)])
+    times = sorted(t for t, _, _ in server.requests)
+    assert times[-1] - times[0] >= 5 * (1 / 20) * 0.9    # 6 request paralel tetap berjarak >= 50 ms
+
+
+def test_session_reuses_connection(server):
+    fetcher = Fetcher(max_workers=1, requests_per_second=None)
+    for i in range(5):
+        fetcher.fetch(f"{server.url}/ok/{i}")
+    assert len({port for _, _, port in server.requests}) == 1    # Semua request lewat satu koneksi TCP
+    fetcher.close()
@@ -0,0 +1,25 @@
+"""Cleaning incremental: sidik jari baris dan folder artefak yang dibaca/ditulis."""
+import os
+
+import pandas as pd
+from scipy import sparse
+
+import scraping
+
+
+def test_row_fingerprints_depend_on_cleaning_version(monkeypatch):
+    df = pd.DataFrame({'property_links': ['https://www.bukitvista.com/property/a'], 'title': ['Villa A']})
+    before = scraping.row_fingerprints(df)
+    assert scraping.row_fingerprints(df) == before
+    monkeypatch.setattr(scraping, "CLEANING_VERSION", scraping.CLEANING_VERSION + 1)
+    assert scraping.row_fingerprints(df) != before    # Hasil cleaning versi lama tidak dipakai ulang
+
+
+def test_saved_artifact_is_found_as_previous_artifact(tmp_path, monkeypatch):
+    monkeypatch.setattr(scraping, "ARTIFACT_DIR", str(tmp_path))
+    df = pd.DataFrame({'title': ['Villa A', 'Villa B'], 'row_hash': ['a', 'b']})
+    features = sparse.csr_matrix([[1.0, 0.0], [0.0, 2.0]])
+    data_path, features_paths = scraping.save_artifact(df, features, {'title': features}, ['title'], '01-01-2026', 1)
+
+    assert all(os.path.dirname(path) == str(tmp_path) for path in [data_path, *features_paths])
+    pd.testing.assert_frame_equal(scraping.load_previous_artifact(scraping.ARTIFACT_DIR), df)
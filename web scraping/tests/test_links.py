@@ -0,0 +1,36 @@
+"""Halaman listing: link properti dan nomor halaman terakhir dari container pagination."""
+import os
+
+import pytest
+
+from links import parse_listing_page, property_key
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+BASE_URL = "https://www.bukitvista.com/property/"
+
+
+@pytest.fixture
+def listing_html():
+    with open(os.path.join(FIXTURE_DIR, "listing_page_1.html"), encoding="utf-8") as f:
+        return f.read()
+
+
+def test_last_page_comes_from_pagination_only(listing_html):
+    # Link /page/N di menu, sidebar dan footer (blog, sitemap lama) tidak ikut dihitung
+    _, last_page = parse_listing_page(listing_html, BASE_URL)
+    assert last_page == 14
+
+
+def test_property_links(listing_html):
+    links, _ = parse_listing_page(listing_html, BASE_URL)
+    assert [property_key(link) for link in links] == [
+        "santorini-surfer-loft-in-uluwatu",
+        "joglo-guest-house-near-prambanan",
+        "cliffside-bungalow-nusa-penida",
+    ]
+    assert links[1] == "https://www.bukitvista.com/property/joglo-guest-house-near-prambanan/"    # URL relatif dibuat absolut
+
+
+def test_page_without_pagination():
+    html = '<div class="item-title"><a href="/property/villa-a/">Villa A</a></div>'
+    assert parse_listing_page(html, BASE_URL) == (["https://www.bukitvista.com/property/villa-a/"], 1)
@@ -0,0 +1,30 @@
+"""extract_property_records: halaman yang hilang dari cache di-download ulang tanpa menghentikan crawl."""
+import socket
+
+import pandas as pd
+import pytest
+
+import scraping
+from extractors import empty_property_record
+from fetcher import Fetcher
+from http_cache import ResponseCache
+
+
+@pytest.fixture
+def closed_port():
+    # Port localhost yang tidak di-listen: koneksi langsung ditolak
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_failed_redownload_gives_empty_record(tmp_path, monkeypatch, closed_port):
+    cache = ResponseCache(str(tmp_path / "http_cache.sqlite"))
+    monkeypatch.setattr(scraping, "response_cache", cache)
+    monkeypatch.setattr(scraping, "fetcher", Fetcher(retries=0, requests_per_second=None, cache=cache))
+
+    # Hash konten yang isinya sudah tidak ada di cache (mis. sudah di-evict) memaksa download ulang
+    pages = pd.DataFrame({"property_links": [f"http://127.0.0.1:{closed_port}/property/villa-a/"],
+                          "content_hash": ["evicted"]})
+    assert scraping.extract_property_records(pages) == [empty_property_record()]
+    cache.close()
@@ -0,0 +1,79 @@
+"""Normalisasi teks dengan cache untuk preprocessing kolom teks properti.
+
+Hasilnya sama persis dengan ``preprocess_text`` di scraping.py: lowercase,
+hapus URL/username/karakter non-alfanumerik, hapus angka dan tanda baca,
+tokenisasi, lematisasi, buang stopwords, lalu stemming. Karena setelah
+regex hanya tersisa huruf dan spasi, tiap kata bisa diproses sendiri-sendiri;
+hasil per kata disimpan di cache LRU dan teks yang sama hanya diproses
+sekali. Batch besar dapat dibagi ke beberapa proses.
+"""
+import re       # Mengimpor re untuk regex yang dikompilasi sekali
+import string       # Mengimpor string untuk daftar tanda baca
+from concurrent.futures import ProcessPoolExecutor      # Mengimpor process pool untuk batch besar
+from functools import lru_cache     # Mengimpor lru_cache untuk cache hasil per kata
+
+from nltk.stem import PorterStemmer, WordNetLemmatizer
+from nltk.tokenize import word_tokenize
+
+# Regex yang sama dengan preprocess_text, dikompilasi sekali
+URL_USERNAME_NON_ALNUM = re.compile(r"(@[A-Za-z0-9]+)|([^0-9A-Za-z \t])|(\w+:\/\/\S+)")
+DIGITS = re.compile(r"\d+")
+PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation)
+
+
+class TextNormalizer:
+    """Pengganti ``preprocess_text`` dengan cache per kata, dedupe teks, dan opsi multiprocessing.
+
+    ``processes`` > 1 membagi teks unik ke beberapa proses jika jumlahnya
+    minimal ``parallel_threshold``; selain itu semua diproses di proses ini.
+    """
+
+    def __init__(self, stop_words, cache_size=100_000, processes=None, parallel_threshold=20_000):
+        self.stop_words = frozenset(stop_words)
+        self.cache_size = cache_size
+        self.processes = processes
+        self.parallel_threshold = parallel_threshold
+        self.lemmatizer = WordNetLemmatizer()
+        self.stemmer = PorterStemmer()
+        self.normalize_word = lru_cache(maxsize=cache_size)(self._normalize_word)    # Cache kata -> hasil lematisasi + stemming
+
+    def _normalize_word(self, word):
+        # Tokenisasi satu kata (mis. "cannot" -> "can", "not"), lematisasi, buang stopwords, lalu stemming
+        tokens = [self.lemmatizer.lemmatize(token) for token in word_tokenize(word)]
+        return ' '.join(self.stemmer.stem(token) for token in tokens if token not in self.stop_words)
+
+    def normalize(self, text):
+        # Langkah regex sama dengan preprocess_text
+        text = text.lower().strip()
+        text = URL_USERNAME_NON_ALNUM.sub(" ", text)
+        text = DIGITS.sub("", text)
+        text = text.translate(PUNCTUATION_TABLE)
+        # Kata yang seluruh tokennya stopword menghasilkan string kosong dan dilewati
+        return ' '.join(filter(None, map(self.normalize_word, text.split())))
+
+    def normalize_many(self, texts):
+        # Normalisasi banyak teks; teks yang sama hanya diproses sekali, urutan hasil sama dengan input
+        texts = list(texts)
+        unique_texts = list(dict.fromkeys(texts))
+
+        if self.processes and self.processes > 1 and len(unique_texts) >= self.parallel_threshold:
+            chunk_size = -(-len(unique_texts) // (self.processes * 4))
+            chunks = [unique_texts[i:i + chunk_size] for i in range(0, len(unique_texts), chunk_size)]
+            with ProcessPoolExecutor(max_workers=self.processes, initializer=_init_worker,
+                                     initargs=(self.stop_words, self.cache_size)) as executor:
+                results = [text for chunk in executor.map(_normalize_chunk, chunks) for text in chunk]
+        else:
+            results = [self.normalize(text) for text in unique_texts]
+
+        normalized = dict(zip(unique_texts, results))
+        return [normalized[text] for text in texts]
+
+
+_worker_normalizer = None    # Normalizer milik tiap proses worker
+
+def _init_worker(stop_words, cache_size):
+    global _worker_normalizer
+    _worker_normalizer = TextNormalizer(stop_words, cache_size=cache_size)
+
+def _normalize_chunk(texts):
+    return [_worker_normalizer.normalize(text) for text in texts]
@@ -0,0 +1,68 @@
+"""Model TF-IDF yang sudah di-fit, disimpan sebagai artefak berversi.
+
+File ``tfidf_model_v<versi>.pkl`` berisi vectorizer per kolom beserta
+metadata fit. Selama model tidak di-fit ulang, kolom fitur tetap bermakna
+sama dari hari ke hari dan properti baru cukup di-``transform``.
+"""
+import os       # Mengimpor os
+import pickle       # Mengimpor pickle untuk menyimpan vectorizer scikit-learn
+import re       # Mengimpor re untuk membaca versi dari nama file
+from datetime import datetime, timezone     # Mengimpor datetime untuk waktu fit
+
+import sklearn
+
+TFIDF_MODEL_FORMAT = 1    # Versi format file model
+TFIDF_MODEL_PATTERN = re.compile(r"tfidf_model_v(\d+)\.pkl")    # Pola nama file model
+
+# Fungsi untuk nama file model versi tertentu
+def tfidf_model_file_name(version):
+    return f"tfidf_model_v{version}.pkl"
+
+# Fungsi untuk mencari versi model terbaru di folder (0 jika belum ada)
+def latest_tfidf_model_version(directory):
+    versions = [int(match.group(1)) for match in map(TFIDF_MODEL_PATTERN.fullmatch, os.listdir(directory)) if match]
+    return max(versions, default=0)
+
+# Fungsi untuk membungkus vectorizer hasil fit menjadi model berversi (belum ditulis ke disk)
+def new_tfidf_model(vectorizers, version, n_documents):
+    return {
+        "format": TFIDF_MODEL_FORMAT,
+        "model_version": version,
+        "fitted_at": datetime.now(timezone.utc).isoformat(),
+        "n_documents": n_documents,
+        "sklearn_version": sklearn.__version__,
+        "vocabulary_sizes": {name: len(v.vocabulary_) for name, v in vectorizers.items()},
+        "vectorizers": vectorizers,
+    }
+
+# Fungsi untuk menyimpan model ke folder (ditulis ke file sementara lalu diganti secara atomik)
+def save_tfidf_model(model, directory):
+    path = os.path.join(directory, tfidf_model_file_name(model["model_version"]))
+    with open(path + ".tmp", "wb") as f:
+        pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(path + ".tmp", path)
+    return path
+
+# Fungsi untuk memuat model terbaru dari folder (None jika belum ada)
+def load_latest_tfidf_model(directory):
+    version = latest_tfidf_model_version(directory)
+    if version == 0:
+        return None
+    with open(os.path.join(directory, tfidf_model_file_name(version)), "rb") as f:
+        model = pickle.load(f)
+    if model.get("format") != TFIDF_MODEL_FORMAT:
+        raise ValueError(f"Unsupported TF-IDF model format {model.get('format')} (expected {TFIDF_MODEL_FORMAT}).")
+    if model["sklearn_version"] != sklearn.__version__:
+        print(f"Peringatan: model TF-IDF dibuat dengan scikit-learn {model['sklearn_version']}, "
+              f"sekarang {sklearn.__version__}")
+    return model
+
+# Fungsi untuk menghitung proporsi token yang dikenal vocabulary (indikator drift)
+def vocabulary_coverage(vectorizer, texts):
+    analyzer = vectorizer.build_analyzer()
+    total = known = 0
+    for text in texts:
+        tokens = analyzer(text)
+        total += len(tokens)
+        known += sum(token in vectorizer.vocabulary_ for token in tokens)
+    return known / total if total else 1.0
@@ -27,15 +27,25 @@ timestamp = datetime.now().strftime("%d-%m-%Y")
 
 # Daftar nama file yang akan diunggah, ditambahkan tanggal pada nama file
 files_to_upload = [
-    f"data_bukit_vista_{timestamp}.xlsx",
+    # Unggah komponen CSR matriks fitur lebih dulu agar aplikasi tidak melihat Parquet tanpa fiturnya
+    f"features_bukit_vista_{timestamp}.data.npy",
+    f"features_bukit_vista_{timestamp}.indices.npy",
+    f"features_bukit_vista_{timestamp}.indptr.npy",
+    f"data_bukit_vista_{timestamp}.parquet",
+    f"property_description_{timestamp}.parquet",
+    f"data_bukit_vista_{timestamp}.xlsx",    # Ekspor Excel opsional, dilewati jika tidak dibuat
     f"property_description_{timestamp}.xlsx"
 ]
 
+# Folder artefak lokal (sama dengan ARTIFACT_DIR di scraping.py)
+ARTIFACT_DIR = "."
+
 # ID folder tujuan di Google Drive
 FOLDER_ID = '1zdLvHzqvv0PGJ6Bt5zhL52yxMTi845ou'
 
 # Looping untuk mengunggah semua file dalam daftar
 for file in files_to_upload:
+    file = os.path.join(ARTIFACT_DIR, file)
     if os.path.exists(file):    # Cek apakah file tersedia di direktori lokal
         upload_to_drive(file, FOLDER_ID)    # Panggil fungsi upload jika file ada
     else: